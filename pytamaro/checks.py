@@ -126,15 +126,21 @@ def area_message(error_message_key: str, width: float, height: float) -> str:
     return translate(error_message_key, f"{round(width)}x{round(height)}")
 
 
-def check_graphic_size(rounded_size: ISize):
+def check_graphic_size(rounded_size: ISize, allow_large: bool = False):
     """Raises an exception when the provided size is not valid for a
     graphic because its area would be empty or too large.
 
     :param rounded_size: the rounded size to be checked
+    :param allow_large: whether a large area is valid (because the graphic
+                        is not rendered at once), up to a larger limit
     """
     width = rounded_size.width
     height = rounded_size.height
     if rounded_size.empty_area():
         raise ValueError(area_message("EMPTY_AREA_OUTPUT", width, height))
-    if rounded_size.too_large_area():
+    if allow_large:
+        too_large = rounded_size.too_large_tiled_area()
+    else:
+        too_large = rounded_size.too_large_area()
+    if too_large:
         raise ValueError(area_message("TOO_LARGE_AREA_OUTPUT", width, height))
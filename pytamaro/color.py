@@ -1,6 +1,7 @@
 """`Color` type, functions to produce colors, and constants for important colors."""
 
 from dataclasses import dataclass
+from functools import cached_property
 
 from pytamaro.localization import translate
 
@@ -29,7 +30,7 @@ class Color:
         alpha_repr = "" if self.alpha == 1 else f", {self.alpha}"
         return f"{translate('rgb_color')}({self.red}, {self.green}, {self.blue}{alpha_repr})"
 
-    @property
+    @cached_property
     def value_for_spec(self) -> int:
         """ARGB 32-bit word, to be used in a spec.
 
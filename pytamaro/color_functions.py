@@ -2,9 +2,13 @@
 
 from pytamaro.checks import check_range
 from pytamaro.color import Color
+from pytamaro.impl.interning import Interner
 
 # ruff: noqa: PLR2004, D100
 
+# Shares equal colors, when interning is enabled.
+_interner: Interner[Color] = Interner()
+
 
 def rgb_color(red: int, green: int, blue: int, opacity: float = 1.0) -> Color:
     """Returns a color with the provided components for red (R), green (G) and blue (B) and a
@@ -27,7 +31,7 @@ def rgb_color(red: int, green: int, blue: int, opacity: float = 1.0) -> Color:
     check_range(green, 0, 255, "green")
     check_range(blue, 0, 255, "blue")
     check_range(opacity, 0, 1, "opacity")
-    return Color(red, green, blue, opacity)
+    return _interner.intern(Color, red, green, blue, opacity)
 
 
 def hsv_color(hue: float, saturation: float, value: float, opacity: float = 1.0) -> Color:
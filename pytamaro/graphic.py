@@ -1,7 +1,10 @@
 """Type `Graphic`, that includes a graphic with a pinning position."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from dataclasses import dataclass
+from functools import wraps
+from typing import TypeVar
 
 from pytamaro.color import Color
 from pytamaro.localization import translate
@@ -9,6 +12,27 @@ from pytamaro.point import Point
 from pytamaro.point_names import bottom_center, center, center_left, center_right, top_center
 from pytamaro.utils import Spec
 
+_SpecWithDeps = tuple[Spec, list["Graphic"]]
+_G = TypeVar("_G", bound="Graphic")
+
+
+def _memoized(spec_with_deps: Callable[[_G], _SpecWithDeps]) -> Callable[[_G], _SpecWithDeps]:
+    """Keeps the result of `spec_with_deps` on the (frozen) graphic, so that the spec
+    of a graphic is computed only once, even when it is part of many graphics.
+    The returned spec is shared, and must not be modified.
+    """
+
+    @wraps(spec_with_deps)
+    def memoized(self: _G) -> _SpecWithDeps:
+        try:
+            return self._spec_with_deps  # type: ignore
+        except AttributeError:
+            result = spec_with_deps(self)
+            object.__setattr__(self, "_spec_with_deps", result)
+            return result
+
+    return memoized
+
 
 @dataclass(frozen=True)
 class Graphic(ABC):
@@ -21,6 +45,9 @@ class Graphic(ABC):
       position).
     """
 
+    # No per-instance dictionary, so that implementations can define a compact layout.
+    __slots__ = ()
+
     @abstractmethod
     def spec_with_deps(self) -> tuple[Spec, list]:
         """Returns a tuple that "declaratively specifies" this graphic.
@@ -37,6 +64,7 @@ class Empty(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('empty_graphic')}()"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         return {
             "t": "Empty",
@@ -54,6 +82,7 @@ class Rectangle(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('rectangle')}({self.width}, {self.height}, {self.color})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         return {
             "t": "Rectangle",
@@ -74,6 +103,7 @@ class Ellipse(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('ellipse')}({self.width}, {self.height}, {self.color})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         return {
             "t": "Ellipse",
@@ -96,6 +126,7 @@ class CircularSector(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('circular_sector')}({self.radius}, {self.angle}, {self.color})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         return {
             "t": "CircularSector",
@@ -122,6 +153,7 @@ class Triangle(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('triangle')}({self.side1}, {self.side2}, {self.angle}, {self.color})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         return {
             "t": "Triangle",
@@ -147,6 +179,7 @@ class Text(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('text')}({self.text!r}, {self.font_name!r}, {self.text_size}, {self.color})"  # noqa: E501
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         return {
             "t": "Text",
@@ -169,6 +202,7 @@ class Compose(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('compose')}({self.foreground}, {self.background})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         spec: Spec = {"t": "Compose"}
         deps: list[Graphic] = []
@@ -200,14 +234,15 @@ class Pin(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('pin')}({self.pinning_point}, {self.graphic})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         if isinstance(self.graphic, Compose):
             # Optimization: if our direct child is a Compose,
             # we can directly add the pinning position to the spec of the Compose,
             # to skip one level in the tree.
+            # The spec of the child is shared, so it is copied instead of modified.
             child_spec, child_deps = self.graphic.spec_with_deps()
-            child_spec["pin"] = self.pinning_point.value_for_spec
-            return child_spec, child_deps
+            return {**child_spec, "pin": self.pinning_point.value_for_spec}, child_deps
 
         # Regular case
         return {
@@ -229,6 +264,7 @@ class Rotate(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('rotate')}({self.angle}, {self.graphic})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         # Optimization: skip rotations by multiples of 360 degrees
         if (
@@ -254,6 +290,7 @@ class Beside(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('beside')}({self.left_graphic}, {self.right_graphic})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         return {
             "t": "Compose",
@@ -275,6 +312,7 @@ class Above(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('above')}({self.top_graphic}, {self.bottom_graphic})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         return {
             "t": "Compose",
@@ -296,6 +334,7 @@ class Overlay(Graphic):
     def __repr__(self) -> str:  # noqa: D105
         return f"{translate('overlay')}({self.front_graphic}, {self.back_graphic})"
 
+    @_memoized
     def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
         return {
             "t": "Compose",
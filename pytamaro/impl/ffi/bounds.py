@@ -0,0 +1,197 @@
+"""Pure-Python computation of the bounds of graphics of the FFI implementation,
+so that their size is known without sending them to JavaScript.
+
+The bounds follow the same rules as the Skia implementation: each graphic has a
+pinning position, a bounding box and the convex hull of its outline (see
+:file:`impl/geometry.py`), computed from the ones of the graphics it is made of.
+They are computed without recursion and then kept on each graphic, so that
+querying the size of a growing graphic only computes the bounds of the new parts.
+
+The bounds of a text depend on the metrics of its font, which are only known to
+JavaScript: no bounds are computed for graphics that contain a text.
+
+:meta private:
+"""
+
+import math
+from dataclasses import fields
+from typing import NamedTuple
+
+from pytamaro.graphic import (
+    Above,
+    Beside,
+    CircularSector,
+    Compose,
+    Ellipse,
+    Empty,
+    Graphic,
+    Overlay,
+    Pin,
+    Rectangle,
+    Rotate,
+    Text,
+    Triangle,
+)
+from pytamaro.impl.geometry import (
+    Coordinates,
+    Hull,
+    circular_sector_hull,
+    ellipse_hull,
+    hull_bounds,
+    merge_hulls,
+    rectangle_hull,
+    rotate_hull,
+    triangle_hull,
+)
+from pytamaro.point import Point
+from pytamaro.point_names import bottom_center, center, center_left, center_right, top_center
+from pytamaro.utils import Size
+
+# Left, top, right and bottom coordinates.
+Bounds = tuple[float, float, float, float]
+_EMPTY_BOUNDS: Bounds = (0, 0, 0, 0)
+
+
+class Layout(NamedTuple):
+    """Pinning position, bounding box and convex hull of a graphic."""
+
+    pin: Coordinates
+    bounds: Bounds
+    hull: Hull
+
+
+def _primitive_layout(graphic: Graphic) -> Layout | None:
+    """Computes the layout of a graphic that is not made of other graphics.
+
+    :param graphic: graphic without dependencies
+    :returns: its layout, or None for a text
+    """
+    if isinstance(graphic, Rectangle | Ellipse):
+        width, height = graphic.width, graphic.height
+        hull_function = rectangle_hull if isinstance(graphic, Rectangle) else ellipse_hull
+        return Layout((width / 2, height / 2), (0, 0, width, height), hull_function(width, height))
+    if isinstance(graphic, CircularSector):
+        radius = graphic.radius
+        hull = circular_sector_hull(radius, graphic.angle)
+        return Layout((radius, radius), hull_bounds(hull), hull)
+    if isinstance(graphic, Triangle):
+        radians = math.radians(graphic.angle)
+        third_point = (graphic.side2 * math.cos(radians), -graphic.side2 * math.sin(radians))
+        centroid = ((graphic.side1 + third_point[0]) / 3, third_point[1] / 3)
+        hull = triangle_hull(graphic.side1, third_point)
+        return Layout(centroid, hull_bounds(hull), hull)
+    if isinstance(graphic, Empty):
+        return Layout((0, 0), _EMPTY_BOUNDS, ())
+    assert isinstance(graphic, Text)
+    return None
+
+
+def _pin_layout(layout: Layout, point: Point) -> Layout:
+    """Moves the pinning position of a graphic to a point on its bounds."""
+    left, top, right, bottom = layout.bounds
+    x = {-1.0: left, 0.0: (left + right) / 2, 1.0: right}[point.x]
+    y = {1.0: top, 0.0: (top + bottom) / 2, -1.0: bottom}[point.y]
+    return Layout((x, y), layout.bounds, layout.hull)
+
+
+def _compose_layout(foreground: Layout, background: Layout) -> Layout:
+    """Composes two graphics, aligning their pinning positions."""
+    dx = background.pin[0] - foreground.pin[0]
+    dy = background.pin[1] - foreground.pin[1]
+    left, top, right, bottom = foreground.bounds
+    fg_bounds = (left + dx, top + dy, right + dx, bottom + dy)
+    if len(foreground.hull) == 0:
+        bounds = background.bounds
+    elif len(background.hull) == 0:
+        bounds = fg_bounds
+    else:
+        bounds = (
+            min(background.bounds[0], fg_bounds[0]),
+            min(background.bounds[1], fg_bounds[1]),
+            max(background.bounds[2], fg_bounds[2]),
+            max(background.bounds[3], fg_bounds[3]),
+        )
+    return Layout(background.pin, bounds, merge_hulls(background.hull, foreground.hull, dx, dy))
+
+
+def _simple_compose_layout(
+    layout1: Layout, layout2: Layout, point1: Point, point2: Point
+) -> Layout:
+    """Composes two graphics pinned on the given points, pinning the result on its center."""
+    composed = _compose_layout(_pin_layout(layout1, point1), _pin_layout(layout2, point2))
+    return _pin_layout(composed, center)
+
+
+def _rotate_layout(layout: Layout, angle: float) -> Layout:
+    """Rotates a graphic around its pinning position."""
+    hull = rotate_hull(layout.hull, angle, layout.pin)
+    bounds = hull_bounds(hull) if len(hull) > 0 else _EMPTY_BOUNDS
+    return Layout(layout.pin, bounds, hull)
+
+
+def _operation_layout(graphic: Graphic, layouts: list[Layout]) -> Layout:
+    """Computes the layout of a graphic made of other graphics.
+
+    :param graphic: graphic with dependencies
+    :param layouts: layouts of its dependencies, in the order of its fields
+    :returns: its layout
+    """
+    if isinstance(graphic, Pin):
+        return _pin_layout(layouts[0], graphic.pinning_point)
+    if isinstance(graphic, Rotate):
+        return _rotate_layout(layouts[0], graphic.angle)
+    first, second = layouts
+    if isinstance(graphic, Compose):
+        return _compose_layout(first, second)
+    if isinstance(graphic, Beside):
+        return _simple_compose_layout(first, second, center_right, center_left)
+    if isinstance(graphic, Above):
+        return _simple_compose_layout(first, second, bottom_center, top_center)
+    assert isinstance(graphic, Overlay)
+    return _simple_compose_layout(first, second, center, center)
+
+
+def _dependencies(graphic: Graphic) -> list[Graphic]:
+    """Returns the graphics a graphic is made of, in the order of its fields."""
+    values = (getattr(graphic, field.name) for field in fields(graphic))
+    return [value for value in values if isinstance(value, Graphic)]
+
+
+def graphic_layout(graphic: Graphic) -> Layout | None:
+    """Computes the layout of a graphic, keeping it on the graphic (and on all the
+    graphics it is made of) to reuse it.
+
+    :param graphic: graphic of the FFI implementation
+    :returns: its layout, or None if it contains a text
+    """
+    graphics_to_process: list[tuple[Graphic, bool]] = [(graphic, False)]
+    while len(graphics_to_process) > 0:
+        current, dependencies_done = graphics_to_process.pop()
+        if "_layout" in current.__dict__:
+            continue
+        dependencies = _dependencies(current)
+        if not dependencies_done and len(dependencies) > 0:
+            graphics_to_process.append((current, True))
+            graphics_to_process.extend((dependency, False) for dependency in dependencies)
+            continue
+        if len(dependencies) == 0:
+            layout = _primitive_layout(current)
+        else:
+            layouts = [dependency.__dict__["_layout"] for dependency in dependencies]
+            layout = None if None in layouts else _operation_layout(current, layouts)
+        object.__setattr__(current, "_layout", layout)
+    return graphic.__dict__["_layout"]
+
+
+def graphic_size(graphic: Graphic) -> Size | None:
+    """Computes the size of a graphic of the FFI implementation.
+
+    :param graphic: graphic whose size is computed
+    :returns: its size, or None if it contains a text (whose bounds are only known
+              to JavaScript)
+    """
+    layout = graphic_layout(graphic)
+    if layout is None:
+        return None
+    left, top, right, bottom = layout.bounds
+    return Size(right - left, bottom - top)
@@ -0,0 +1,133 @@
+"""Compact binary encoding of a sequence of specs.
+
+Instead of a list of dictionaries (one per node), the specs are packed into a
+single contiguous buffer of 32-bit words, that can cross the boundary between
+Python and JavaScript without converting each spec.
+
+Each spec is encoded as a header word, containing the opcode of its type (in
+the lowest 16 bits) and the number of its fields (in the highest 16 bits),
+followed by its fields. Each field is encoded as the identifier of its key,
+followed by its value:
+
+- numbers are encoded as one 32-bit float (losing precision, like points);
+- colors, and the indices of referenced specs, are encoded as one word;
+- points are encoded as two words (the 32-bit floats of their coordinates);
+- strings are encoded as their length in bytes (UTF-8), followed by the bytes,
+  padded with zeros to a multiple of 4 bytes.
+
+:meta private:
+"""
+
+from array import array
+from struct import pack, unpack
+
+from pytamaro.utils import Spec
+
+# Types of the graphics, whose position is their opcode.
+_TYPES = (
+    "Empty",
+    "Rectangle",
+    "Ellipse",
+    "CircularSector",
+    "Triangle",
+    "Text",
+    "Compose",
+    "Pin",
+    "Rotate",
+    "Ref",
+)
+_NUMBER, _COLOR, _POINT, _STRING, _INDEX = range(5)
+# Keys of the specs and the kind of their values, whose position is their identifier.
+_FIELDS = (
+    ("width", _NUMBER),
+    ("height", _NUMBER),
+    ("radius", _NUMBER),
+    ("angle", _NUMBER),
+    ("side1", _NUMBER),
+    ("side2", _NUMBER),
+    ("text_size", _NUMBER),
+    ("color", _COLOR),
+    ("pin", _POINT),
+    ("fg_pin", _POINT),
+    ("bg_pin", _POINT),
+    ("text", _STRING),
+    ("font_name", _STRING),
+    ("index", _INDEX),
+    ("alpha", _NUMBER),
+)
+_OPCODES = {name: opcode for opcode, name in enumerate(_TYPES)}
+_FIELD_IDS = {key: (field_id, kind) for field_id, (key, kind) in enumerate(_FIELDS)}
+_WORD_MASK = 0xFFFFFFFF
+_WORD_SIZE = 4
+
+
+def _float_word(value: float) -> int:
+    return unpack("=I", pack("=f", value))[0]
+
+
+def _word_float(word: int) -> float:
+    return unpack("=f", pack("=I", word))[0]
+
+
+def encode_specs(specs: list[Spec]) -> array:
+    """Packs a sequence of specs into a buffer of 32-bit words.
+
+    :param specs: specs, as produced by `to_specs`
+    :returns: the buffer, whose memory can be shared without copying it
+    """
+    words = array("I")
+    for spec in specs:
+        words.append(_OPCODES[spec["t"]] | (len(spec) - 1) << 16)
+        for key, value in spec.items():
+            if key == "t":
+                continue
+            field_id, kind = _FIELD_IDS[key]
+            words.append(field_id)
+            if kind == _NUMBER:
+                words.append(_float_word(value))
+            elif kind in (_COLOR, _INDEX):
+                words.append(value)
+            elif kind == _POINT:
+                words.append(value >> 32)
+                words.append(value & _WORD_MASK)
+            else:
+                data = value.encode()
+                words.append(len(data))
+                padding = -len(data) % _WORD_SIZE
+                words.frombytes(data + bytes(padding))
+    return words
+
+
+def decode_specs(words: array) -> list[Spec]:
+    """Unpacks a sequence of specs from a buffer of 32-bit words.
+    Numbers are decoded as the 32-bit floats they were encoded to.
+
+    :param words: buffer produced by `encode_specs`
+    :returns: the specs
+    """
+    specs: list[Spec] = []
+    index = 0
+    while index < len(words):
+        header = words[index]
+        index += 1
+        spec: Spec = {"t": _TYPES[header & 0xFFFF]}
+        for _ in range(header >> 16):
+            key, kind = _FIELDS[words[index]]
+            index += 1
+            if kind == _NUMBER:
+                spec[key] = _word_float(words[index])
+                index += 1
+            elif kind in (_COLOR, _INDEX):
+                spec[key] = words[index]
+                index += 1
+            elif kind == _POINT:
+                spec[key] = words[index] << 32 | words[index + 1]
+                index += 2
+            else:
+                length = words[index]
+                size = (length + _WORD_SIZE - 1) // _WORD_SIZE
+                data = words[index + 1 : index + 1 + size].tobytes()
+                spec[key] = data[:length].decode()
+                index += 1 + size
+        specs.append(spec)
+    return specs
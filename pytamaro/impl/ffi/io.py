@@ -11,6 +11,7 @@ from PIL.Image import Image as PILImage
 
 from pytamaro.checks import check_graphic, check_graphic_size, check_type
 from pytamaro.graphic import Graphic
+from pytamaro.impl.ffi.bounds import graphic_size as local_graphic_size
 from pytamaro.impl.ffi.specs import to_specs
 from pytamaro.impl.shared_io import guess_scaling_factor, print_data_uri
 from pytamaro.utils import Size, Spec
@@ -24,7 +25,7 @@ from pytamaro_js_ffi import (  # type: ignore
 # ruff: noqa: D103
 def _render_graphic_base64(graphic: Graphic, debug: bool) -> str:
     specs = to_specs(graphic)
-    rounded_size = graphic_size(specs).to_round()
+    rounded_size = graphic_size(graphic, specs).to_round()
     check_graphic_size(rounded_size)
     scaling_factor = guess_scaling_factor(rounded_size)
     return js_render_graphic(specs, scaling_factor, debug)
@@ -34,7 +35,11 @@ def extract_base64_image_data(data_uri: str) -> str:
     return data_uri.split(",")[1]
 
 
-def graphic_size(specs: list[Spec]):
+def graphic_size(graphic: Graphic, specs: list[Spec]) -> Size:
+    # The size is computed locally, unless the graphic contains a text.
+    size = local_graphic_size(graphic)
+    if size is not None:
+        return size
     js_size = js_graphic_size(specs)
     return Size(js_size.width, js_size.height)
 
@@ -48,7 +53,7 @@ def show_graphic(graphic: Graphic, debug: bool):
 
 def graphic_to_pillow_image(graphic: Graphic) -> PILImage:
     specs = to_specs(graphic)
-    rounded_size = graphic_size(specs).to_round()
+    rounded_size = graphic_size(graphic, specs).to_round()
     check_graphic_size(rounded_size)
     scaling_factor = guess_scaling_factor(rounded_size)
     data_uri = js_render_graphic(specs, scaling_factor, False)
@@ -56,6 +61,10 @@ def graphic_to_pillow_image(graphic: Graphic) -> PILImage:
     return Image.open(data)
 
 
+def graphics_to_pillow_images(graphics: list[Graphic]) -> list[PILImage]:
+    return [graphic_to_pillow_image(graphic) for graphic in graphics]
+
+
 def save_graphic(filename: str, graphic: Graphic, debug: bool):
     check_type(filename, str, "filename")
     check_graphic(graphic)
@@ -0,0 +1,58 @@
+"""Local implementation of the `pytamaro_js_ffi` module, which is otherwise only
+available inside a Pyodide host, based on Skia.
+
+It interprets the specs sent by the FFI implementation, so that the FFI code path
+can be selected, tested and benchmarked on a normal machine. It must be installed
+(see `install()`) before the FFI implementation is imported.
+
+:meta private:
+"""
+
+import base64
+import sys
+
+from skia import EncodedImageFormat
+
+from pytamaro.impl.skia.io import render_cached
+from pytamaro.impl.skia.specs import graphic_from_specs
+from pytamaro.utils import Size, Spec
+
+
+def install():
+    """Makes this module available as `pytamaro_js_ffi`."""
+    sys.modules["pytamaro_js_ffi"] = sys.modules[__name__]
+
+
+def js_graphic_size(specs: list[Spec]) -> Size:
+    """Computes the size of the graphic described by a list of specs.
+
+    :param specs: specs of the graphic
+    :returns: the size of the graphic
+    """
+    skia_size = graphic_from_specs(specs).size()
+    return Size(skia_size.width(), skia_size.height())
+
+
+def js_render_graphic(specs: list[Spec], scaling_factor: int, debug: bool) -> str:
+    """Renders the graphic described by a list of specs into a PNG image,
+    with the Skia implementation (reusing its caches of rendered images).
+
+    :param specs: specs of the graphic
+    :param scaling_factor: factor used for super-sampling (the Skia implementation
+                           guesses the same one, from the size of the graphic)
+    :param debug: whether to add debugging information to the graphic
+    :returns: the image, as a data URI
+    """
+    image = render_cached(graphic_from_specs(specs), debug)
+    data = image.encodeToData(EncodedImageFormat.kPNG, 100).bytes()
+    return f"data:image/png;base64,{base64.b64encode(data).decode('utf-8')}"
+
+
+def js_save(filename: str, data_uri: str):
+    """Saves an image to a file.
+
+    :param filename: name of the file to be created
+    :param data_uri: image, as a data URI
+    """
+    with open(filename, "wb") as stream:
+        stream.write(base64.b64decode(data_uri.split(",")[1]))
@@ -4,6 +4,7 @@
 """
 
 from pytamaro.graphic import Above, Beside, Compose, Graphic, Overlay, Pin, Rotate
+from pytamaro.impl.ffi.bounds import graphic_size
 from pytamaro.impl.ffi.specs import to_specs
 from pytamaro.point import Point
 from pytamaro_js_ffi import js_graphic_size  # type: ignore
@@ -12,11 +13,17 @@ from pytamaro_js_ffi import js_graphic_size  # type: ignore
 
 
 def graphic_width(graphic: Graphic) -> int:
-    return round(js_graphic_size(to_specs(graphic)).width)
+    size = graphic_size(graphic)
+    if size is None:
+        return round(js_graphic_size(to_specs(graphic)).width)
+    return round(size.width)
 
 
 def graphic_height(graphic: Graphic) -> int:
-    return round(js_graphic_size(to_specs(graphic)).height)
+    size = graphic_size(graphic)
+    if size is None:
+        return round(js_graphic_size(to_specs(graphic)).height)
+    return round(size.height)
 
 
 def compose(foreground_graphic: Graphic, background_graphic: Graphic) -> Graphic:
@@ -4,25 +4,83 @@ A sequence of specs can be used to draw a graphic without having to perform a
 recursive traversal of the graphic tree. This is useful in scenarios where we
 are constrained by a small stack that cannot host many stack frames.
 
+The specs are in postfix order: each spec is preceded by the specs of the graphics
+it depends on (the last one first), so that they can be evaluated with a stack.
+When the same graphic object is used more than once, its specs can optionally be
+emitted only once: the following uses are specs `{"t": "Ref", "index": i}`, that
+reuse the graphic evaluated for the spec at position `i`.
+Specs can also optionally be exact, to rebuild the very same graphic from them (e.g.,
+in another process): colors keep their exact alpha (besides their ARGB word), and
+rotations by multiples of 360 degrees are kept.
+
 :meta private:
 """
 
-from pytamaro.graphic import Graphic
+from pytamaro.graphic import Graphic, Rotate
 from pytamaro.utils import Spec
 
 
-def to_specs(graphic: Graphic) -> list[Spec]:
+def to_specs(graphic: Graphic, dedup: bool = False, exact: bool = False) -> list[Spec]:
     """Turn a graphic into a list of specs,
     processing (without recursion) the recursive dependencies.
+
+    :param graphic: graphic to turn into specs
+    :param dedup: whether to emit the specs of a graphic object used more than once
+                  only for its first use, referencing them for the following uses
+    :param exact: whether to emit exact specs (see `_exact_spec_with_deps()`)
+    :returns: the specs, in postfix order
     """
+    if dedup:
+        return _to_specs_with_refs(graphic, exact)
     graphics_to_process: list[Graphic] = [graphic]
     specs: list[Spec] = []
 
     while len(graphics_to_process) > 0:
         graphic = graphics_to_process.pop()
-        spec, deps = graphic.spec_with_deps()
+        spec, deps = _exact_spec_with_deps(graphic) if exact else graphic.spec_with_deps()
         graphics_to_process.extend(reversed(deps))
         specs.append(spec)
 
     specs.reverse()
     return specs
+
+
+def _exact_spec_with_deps(graphic: Graphic) -> tuple[Spec, list[Graphic]]:
+    """Returns the spec of a graphic (and the graphics it depends on) without losing
+    any information: the spec of a colored graphic also has the exact alpha of its
+    color, and rotations by multiples of 360 degrees (which can change the bounds
+    of a graphic, e.g., of a text) are not skipped.
+    """
+    if isinstance(graphic, Rotate):
+        return {"t": "Rotate", "angle": graphic.angle}, [graphic.graphic]
+    spec, deps = graphic.spec_with_deps()
+    if "color" in spec:
+        # The spec is shared, so it is copied instead of modified.
+        spec = {**spec, "alpha": graphic.color.alpha}  # type: ignore
+    return spec, deps
+
+
+def _to_specs_with_refs(graphic: Graphic, exact: bool) -> list[Spec]:
+    """Turn a graphic into a list of specs, referencing the specs already emitted for
+    graphic objects used more than once, so that the size of the list is linear in
+    the number of distinct graphic objects.
+    """
+    # Pending graphics, with their spec once their dependencies have been scheduled.
+    graphics_to_process: list[tuple[Graphic, Spec | None]] = [(graphic, None)]
+    # Position of the spec emitted for each graphic object, by identity.
+    indices: dict[int, int] = {}
+    specs: list[Spec] = []
+
+    while len(graphics_to_process) > 0:
+        graphic, spec = graphics_to_process.pop()
+        if spec is not None:
+            indices[id(graphic)] = len(specs)
+            specs.append(spec)
+        elif id(graphic) in indices:
+            specs.append({"t": "Ref", "index": indices[id(graphic)]})
+        else:
+            spec, deps = _exact_spec_with_deps(graphic) if exact else graphic.spec_with_deps()
+            graphics_to_process.append((graphic, spec))
+            graphics_to_process.extend((dep, None) for dep in deps)
+
+    return specs
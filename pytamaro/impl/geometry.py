@@ -0,0 +1,250 @@
+"""Backend-independent geometry on convex hulls, used to compute the bounds of
+(rotated) graphics without walking their outlines.
+
+A convex hull is represented as a tuple of (x, y) coordinates, its vertices
+in order along its boundary.
+An empty tuple represents a graphic with no outline.
+
+Curved outlines are enclosed by polygons circumscribed around them (never
+inscribed in them), so that the bounds computed from a hull always contain the
+whole outline, exceeding it by at most a small tolerance.
+
+:meta private:
+"""
+
+import math
+from collections.abc import Iterable
+from functools import lru_cache
+
+Coordinates = tuple[float, float]
+Hull = tuple[Coordinates, ...]
+
+# Maximum distance between a curve and the polygon that encloses it in a hull.
+TOLERANCE = 0.01
+# Minimum and maximum number of vertices used to enclose a full ellipse.
+MIN_ELLIPSE_VERTICES = 8
+MAX_ELLIPSE_VERTICES = 1024
+# Maximum number of distinct hulls of primitives kept in the cache.
+HULL_CACHE_SIZE = 1024
+
+
+def convex_hull(points: Iterable[Coordinates]) -> Hull:
+    """Computes the convex hull of a set of points, using Andrew's monotone chain
+    algorithm.
+
+    :param points: the points to enclose
+    :returns: the vertices of the convex hull
+    """
+    sorted_points = sorted(set(points))
+    if len(sorted_points) <= 2:  # noqa: PLR2004
+        return tuple(sorted_points)
+    return tuple(_half_hull(sorted_points)[:-1] + _half_hull(reversed(sorted_points))[:-1])
+
+
+def _half_hull(sorted_points: Iterable[Coordinates]) -> list[Coordinates]:
+    """Computes the lower (or upper, for points in reverse order) half of the convex
+    hull of a set of sorted points.
+    Each point is kept only if it turns counterclockwise from the last two points
+    kept (the cross product is inlined, as this is the hottest loop when composing
+    many graphics).
+    """
+    half: list[Coordinates] = []
+    for x, y in sorted_points:
+        while len(half) >= 2:  # noqa: PLR2004
+            (ox, oy), (ax, ay) = half[-2], half[-1]
+            if (ax - ox) * (y - oy) - (ay - oy) * (x - ox) > 0:
+                break
+            half.pop()
+        half.append((x, y))
+    return half
+
+
+def merge_hulls(hull1: Hull, hull2: Hull, dx: float = 0, dy: float = 0) -> Hull:
+    """Computes the convex hull of two hulls, the second one being translated.
+
+    :param hull1: first hull
+    :param hull2: second hull
+    :param dx: horizontal translation of the second hull
+    :param dy: vertical translation of the second hull
+    :returns: the convex hull that encloses both hulls
+    """
+    translated = translate_hull(hull2, dx, dy)
+    if len(hull1) == 0:
+        return translated
+    if len(hull2) == 0:
+        return hull1
+    return convex_hull(hull1 + translated)
+
+
+def translate_hull(hull: Hull, dx: float, dy: float) -> Hull:
+    """Translates a hull by the given offset.
+
+    :param hull: hull to translate
+    :param dx: horizontal translation
+    :param dy: vertical translation
+    :returns: the translated hull
+    """
+    if dx == 0 and dy == 0:
+        return hull
+    return tuple((x + dx, y + dy) for x, y in hull)
+
+
+def rotate_hull(hull: Hull, angle: float, center: Coordinates) -> Hull:
+    """Rotates a hull counterclockwise around a center.
+
+    :param hull: hull to rotate
+    :param angle: angle of rotation, in degrees
+    :param center: center of rotation
+    :returns: the rotated hull
+    """
+    radians = math.radians(angle)
+    cos, sin = _snap_to_zero(math.cos(radians)), _snap_to_zero(math.sin(radians))
+    cx, cy = center
+    # Counterclockwise on the screen, where the y axis points down.
+    return tuple(
+        (cx + (x - cx) * cos + (y - cy) * sin, cy - (x - cx) * sin + (y - cy) * cos)
+        for x, y in hull
+    )
+
+
+def _snap_to_zero(value: float) -> float:
+    """Snaps to zero the tiny values produced by trigonometric functions for
+    multiples of 90 degrees, so that such rotations remain exact.
+    """
+    return 0.0 if abs(value) < 1e-12 else value  # noqa: PLR2004
+
+
+def hull_bounds(hull: Hull) -> tuple[float, float, float, float]:
+    """Computes the bounding box of a hull.
+
+    :param hull: a non-empty hull
+    :returns: the left, top, right and bottom coordinates of the bounding box
+    """
+    xs = [x for x, _ in hull]
+    ys = [y for _, y in hull]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _blossom(points: list[Coordinates], parameters: Iterable[float]) -> Coordinates:
+    """Evaluates the blossom (polar form) of a Bézier curve, running the algorithm
+    of de Casteljau with a (possibly) different parameter at each step.
+
+    :param points: control points of the curve
+    :param parameters: as many parameters as the degree of the curve
+    :returns: the value of the blossom
+    """
+    for t in parameters:
+        points = [
+            ((1 - t) * x1 + t * x2, (1 - t) * y1 + t * y2)
+            for (x1, y1), (x2, y2) in zip(points, points[1:], strict=False)
+        ]
+    return points[0]
+
+
+def curve_hull_points(points: list[Coordinates]) -> list[Coordinates]:
+    """Computes points whose convex hull encloses a (non-rational) Bézier curve,
+    exceeding it by at most the tolerance.
+
+    A Bézier curve lies in the convex hull of its control points, whose distance
+    from the curve is bounded by its second differences. The curve is split into
+    equal parts, so that the control points of each part are close enough to it.
+
+    :param points: control points of the curve
+    :returns: the control points of the parts of the curve, after the first point
+    """
+    degree = len(points) - 1
+    second_differences = (
+        math.hypot(x1 - 2 * x2 + x3, y1 - 2 * y2 + y3)
+        for (x1, y1), (x2, y2), (x3, y3) in zip(points, points[1:], points[2:], strict=False)
+    )
+    distance = degree * (degree - 1) / 8 * max(second_differences, default=0)
+    parts = max(1, math.ceil(math.sqrt(distance / TOLERANCE)))
+    result: list[Coordinates] = []
+    for part in range(parts):
+        start, end = part / parts, (part + 1) / parts
+        result.extend(
+            _blossom(points, [start] * (degree - i) + [end] * i) for i in range(1, degree + 1)
+        )
+    return result
+
+
+@lru_cache(maxsize=HULL_CACHE_SIZE)
+def rectangle_hull(width: float, height: float) -> Hull:
+    """Computes the hull of a rectangle whose top-left corner is in the origin."""
+    return convex_hull([(0, 0), (width, 0), (width, height), (0, height)])
+
+
+def _ellipse_vertices(radius: float) -> int:
+    """Computes the number of vertices of a polygon circumscribed around an ellipse
+    whose largest radius is `radius`, so that it exceeds the ellipse by at most the
+    tolerance (which cannot be guaranteed beyond the maximum number of vertices).
+    The result is a multiple of 4, so that the extreme points of the ellipse
+    can be points of tangency of the polygon.
+    """
+    if radius <= TOLERANCE:
+        return MIN_ELLIPSE_VERTICES
+    vertices = math.ceil(math.pi / math.acos(radius / (radius + TOLERANCE)))
+    vertices = 4 * math.ceil(vertices / 4)
+    return max(MIN_ELLIPSE_VERTICES, min(vertices, MAX_ELLIPSE_VERTICES))
+
+
+def _circumscribed_arc(
+    rx: float, ry: float, start: float, end: float, vertices: int
+) -> list[Coordinates]:
+    """Computes the vertices of a polygonal line that encloses an elliptical arc,
+    whose ellipse is inscribed in a rectangle whose top-left corner is in the origin.
+    The arc is split at the angles multiple of a full turn divided by `vertices`
+    (thus at the extreme points of the ellipse), and each of its parts is enclosed by
+    the two lines tangent to its ends, meeting in a vertex.
+    Affine maps preserve tangency, so the polygon is the one of a circle, scaled.
+
+    :param rx: horizontal radius of the ellipse
+    :param ry: vertical radius of the ellipse
+    :param start: counterclockwise angle of the start of the arc, in radians
+    :param end: counterclockwise angle of the end of the arc, in radians
+    :param vertices: number of parts in which a full turn is split
+    :returns: the ends of the arc and the vertices of the polygonal line between them
+    """
+    step = 2 * math.pi / vertices
+    ends = [start]
+    ends.extend(i * step for i in range(math.floor(start / step) + 1, math.ceil(end / step)))
+    ends.append(end)
+    points = [(rx + rx * math.cos(start), ry - ry * math.sin(start))]
+    for part_start, part_end in zip(ends, ends[1:], strict=False):
+        middle = (part_start + part_end) / 2
+        # Distance of the vertex from the center, relative to the radius.
+        scale = 1 / math.cos((part_end - part_start) / 2)
+        points.append((rx + rx * scale * math.cos(middle), ry - ry * scale * math.sin(middle)))
+    points.append((rx + rx * math.cos(end), ry - ry * math.sin(end)))
+    return points
+
+
+@lru_cache(maxsize=HULL_CACHE_SIZE)
+def ellipse_hull(width: float, height: float) -> Hull:
+    """Computes a hull that encloses an ellipse inscribed in a rectangle whose
+    top-left corner is in the origin, shared among all the equal ellipses.
+    """
+    rx, ry = width / 2, height / 2
+    return convex_hull(_circumscribed_arc(rx, ry, 0, 2 * math.pi, _ellipse_vertices(max(rx, ry))))
+
+
+@lru_cache(maxsize=HULL_CACHE_SIZE)
+def circular_sector_hull(radius: float, angle: float) -> Hull:
+    """Computes a hull that encloses a circular sector whose circle is inscribed in
+    a square whose top-left corner is in the origin, shared among all the equal
+    sectors.
+    The arc goes counterclockwise from the rightmost point of the circle.
+    """
+    if angle == 360:  # noqa: PLR2004
+        return ellipse_hull(2 * radius, 2 * radius)
+    vertices = _ellipse_vertices(radius)
+    arc = _circumscribed_arc(radius, radius, 0, math.radians(angle), vertices)
+    return convex_hull([(radius, radius), *arc])
+
+
+@lru_cache(maxsize=HULL_CACHE_SIZE)
+def triangle_hull(side1: float, third_point: Coordinates) -> Hull:
+    """Computes the hull of a triangle with a vertex in the origin, a vertex on the
+    horizontal axis at distance `side1` and a third vertex.
+    """
+    return convex_hull([(0, 0), (side1, 0), third_point])
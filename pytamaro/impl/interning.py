@@ -0,0 +1,80 @@
+"""Interning (hash-consing) of structurally equal values.
+
+When enabled, constructing a value that is structurally equal to one that is
+still alive returns the existing (immutable) value instead of a new copy, so
+that memory use follows the number of distinct values rather than the number
+of calls. Interned values are held through weak references, so that they can
+be freed when no longer used.
+
+Interning is opt-in: it is enabled by setting the environment variable
+`PYTAMARO_INTERN`.
+
+:meta private:
+"""
+
+import os
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+from weakref import WeakValueDictionary
+
+from pytamaro.color import Color
+from pytamaro.graphic import Graphic
+from pytamaro.point import Point
+
+T = TypeVar("T")
+
+
+def interning_enabled() -> bool:
+    """Checks whether interning is enabled.
+
+    :returns: True if the environment variable `PYTAMARO_INTERN` is set
+    """
+    return "PYTAMARO_INTERN" in os.environ
+
+
+def _key_component(value: Any) -> Hashable:
+    """Computes the part of an interning key that corresponds to an argument.
+
+    Graphics are identified by their identity: they are either interned themselves,
+    or distinct objects anyway. Using their identity avoids hashing whole subtrees.
+    Numbers are paired with their type, so that, e.g., `rectangle(10, 10, red)`
+    and `rectangle(10.0, 10.0, red)` (which have a different representation)
+    are not shared.
+
+    :param value: argument of a constructor
+    :returns: a hashable value that identifies the argument
+    """
+    if isinstance(value, Graphic):
+        return id(value)
+    if isinstance(value, Color):
+        return tuple(map(_key_component, (value.red, value.green, value.blue, value.alpha)))
+    if isinstance(value, Point):
+        return _key_component(value.x), _key_component(value.y)
+    return type(value), value
+
+
+class Interner(Generic[T]):
+    """A table of interned values, each one built by a constructor from some arguments."""
+
+    def __init__(self):  # noqa: D107
+        self._values: WeakValueDictionary[Hashable, T] = WeakValueDictionary()
+
+    def intern(self, constructor: Callable[..., T], *args: Any) -> T:
+        """Returns the value built by `constructor` from `args`,
+        sharing an existing structurally equal value when interning is enabled.
+
+        :param constructor: function (or class) that builds the value
+        :param args: arguments for the constructor
+        :returns: the (possibly shared) value
+        """
+        if not interning_enabled():
+            return constructor(*args)
+        key = (constructor, *map(_key_component, args))
+        value = self._values.get(key)
+        if value is None:
+            value = constructor(*args)
+            self._values[key] = value
+        return value
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._values)
@@ -0,0 +1,66 @@
+"""Streaming encoder for PNG images, used to save images that are too large
+to be kept in memory at once.
+
+:meta private:
+"""
+
+import struct
+import zlib
+from typing import BinaryIO
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_BIT_DEPTH = 8
+_RGBA_COLOR_TYPE = 6
+_BYTES_PER_PIXEL = 4
+# Filter type that leaves the bytes of a row unchanged.
+_NO_FILTER = b"\x00"
+
+
+class PNGWriter:
+    """Encodes a PNG image (8-bit RGBA, not premultiplied) row by row, writing
+    compressed data to the file as soon as it is available.
+    """
+
+    def __init__(self, file: BinaryIO, width: int, height: int):
+        """Writes the header of the image.
+
+        :param file: binary file to write the image to
+        :param width: width of the image, in pixels
+        :param height: height of the image, in pixels
+        """
+        self._file = file
+        self._row_size = width * _BYTES_PER_PIXEL
+        self._missing_rows = height
+        self._compressor = zlib.compressobj()
+        file.write(_SIGNATURE)
+        header = struct.pack(">IIBBBBB", width, height, _BIT_DEPTH, _RGBA_COLOR_TYPE, 0, 0, 0)
+        self._write_chunk(b"IHDR", header)
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(chunk_type + data)))
+
+    def write_rows(self, pixels: bytes):
+        """Appends rows to the image.
+
+        :param pixels: RGBA values of the pixels of one or more complete rows
+        """
+        rows = len(pixels) // self._row_size
+        if rows * self._row_size != len(pixels) or rows > self._missing_rows:
+            raise ValueError("The pixels do not fit in the rows of the image")
+        self._missing_rows -= rows
+        for start in range(0, len(pixels), self._row_size):
+            data = self._compressor.compress(_NO_FILTER + pixels[start : start + self._row_size])
+            if len(data) > 0:
+                self._write_chunk(b"IDAT", data)
+
+    def finish(self):
+        """Writes the remaining compressed data and the end of the image.
+        All the rows of the image must have been written.
+        """
+        if self._missing_rows > 0:
+            raise ValueError("Some rows of the image have not been written")
+        self._write_chunk(b"IDAT", self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
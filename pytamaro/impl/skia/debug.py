@@ -4,7 +4,7 @@ from skia import Point
 
 from pytamaro.color import Color
 from pytamaro.color_functions import rgb_color
-from pytamaro.impl.skia.graphic import SkiaGraphic
+from pytamaro.impl.skia.graphic import SkiaGraphic, SkiaOverlay
 from pytamaro.impl.skia.operations import (
     compose,
     graphic_height,
@@ -77,7 +77,9 @@ def add_border(graphic: SkiaGraphic, light: Color, dark: Color) -> SkiaGraphic:
     vertical = rotate(90, border_with_control_points(graphic_height(graphic)))
     top_left_g = compose(pin(top_left, horizontal), pin(top_left, vertical))
     border = compose(pin(bottom_left, top_left_g), pin(bottom_left, rotate(180, top_left_g)))
-    return overlay(control_point, overlay(border, graphic))
+    # Directly construct a new graphic (that is never shared, even when interning is
+    # enabled), because add_debug_info() changes its pinning position.
+    return SkiaOverlay(control_point, overlay(border, graphic))
 
 
 def show_pin_position(graphic: SkiaGraphic, light: Color, dark: Color) -> SkiaGraphic:
@@ -0,0 +1,173 @@
+"""Optional on-disk cache of rendered graphics, shared by all the processes that
+use the same directory (e.g., many short-lived processes rendering the same graphics).
+
+The cache is enabled by setting the environment variable `PYTAMARO_DISK_CACHE_DIR`
+to the directory that hosts it. Its capacity (in bytes) can be configured with the
+environment variable `PYTAMARO_DISK_CACHE_BYTES`: when it is exceeded, the least
+recently used images are removed.
+
+Each rendered image is stored in a file named after a hash of the structural
+digest of the graphic and of the rendering parameters. Files are written
+atomically (renaming a complete temporary file), so that other processes never
+read a partially written image.
+
+The cache never prevents rendering: when it cannot be read or written (e.g., its
+directory cannot be created, or the disk is full), images are simply not cached.
+
+:meta private:
+"""
+
+import os
+import struct
+import time
+import zlib
+from contextlib import suppress
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+import skia
+from skia import Image, kPremul_AlphaType, kRGBA_8888_ColorType
+
+import pytamaro
+from pytamaro.impl.skia.render_cache import RenderKey
+
+# Default capacity of the cache, in bytes.
+DEFAULT_CAPACITY = 256 * 1024 * 1024
+# Version of the format of the files, part of their names.
+_FORMAT_VERSION = 1
+_SUFFIX = ".img"
+_TEMPORARY_SUFFIX = ".tmp"
+# Age (in seconds) after which a temporary file is considered left behind by a
+# process that could not complete writing it.
+_STALE_TEMPORARY_AGE = 3600
+_HEADER = struct.Struct(">II")
+
+
+def disk_cache_directory() -> Path | None:
+    """Returns the directory of the on-disk cache.
+
+    :returns: the value of the environment variable `PYTAMARO_DISK_CACHE_DIR`,
+              or None if the cache is not enabled
+    """
+    directory = os.environ.get("PYTAMARO_DISK_CACHE_DIR")
+    return Path(directory) if directory else None
+
+
+def disk_cache_capacity() -> int:
+    """Returns the capacity of the on-disk cache, in bytes.
+
+    :returns: the value of the environment variable `PYTAMARO_DISK_CACHE_BYTES`,
+              or a default capacity when it is not set
+    """
+    return int(os.environ.get("PYTAMARO_DISK_CACHE_BYTES", DEFAULT_CAPACITY))
+
+
+def _file_name(key: RenderKey) -> str:
+    """Computes the name of the file that stores a rendered image.
+    The versions of PyTamaro and of Skia are part of the name, as they might render
+    differently (e.g., after an upgrade, with a cache directory shared by both).
+
+    :param key: digest of the graphic, scaling factor, debug flag, text mode and batching
+    :returns: the name of the file
+    """
+    digest, scaling_factor, debug, text_blobs, batching = key
+    hasher = sha256(digest)
+    parameters = f"{scaling_factor}:{debug}:{text_blobs}:{batching}"
+    hasher.update(f"{parameters}:{pytamaro.__version__}:{skia.__version__}".encode())
+    return f"{hasher.hexdigest()}-{_FORMAT_VERSION}{_SUFFIX}"
+
+
+def load(key: RenderKey) -> Image | None:
+    """Looks up a rendered image in the on-disk cache.
+
+    :param key: digest of the graphic, scaling factor, debug flag, text mode and batching
+    :returns: the cached image, or None if it is not cached (or the cache is not enabled)
+    """
+    directory = disk_cache_directory()
+    if directory is None:
+        return None
+    path = directory / _file_name(key)
+    try:
+        data = path.read_bytes()
+        # Mark the image as recently used.
+        os.utime(path)
+        width, height = _HEADER.unpack_from(data)
+        pixels = zlib.decompress(data[_HEADER.size :])
+    except (OSError, struct.error, zlib.error):
+        # Not cached, or removed (or being replaced) by another process.
+        return None
+    if len(pixels) != width * height * 4:
+        return None
+    return Image.frombytes(pixels, (width, height), kRGBA_8888_ColorType, kPremul_AlphaType)
+
+
+def store(key: RenderKey, image: Image):
+    """Adds a rendered image to the on-disk cache (if enabled), removing the least
+    recently used images if its capacity is exceeded.
+    The (premultiplied) pixels are stored, so that loading them gives back exactly
+    the same image.
+
+    :param key: digest of the graphic, scaling factor, debug flag, text mode and batching
+    :param image: rendered image
+    """
+    directory = disk_cache_directory()
+    if directory is None:
+        return
+    pixels = image.convert(alphaType=kPremul_AlphaType, colorType=kRGBA_8888_ColorType).tobytes()
+    data = _HEADER.pack(image.width(), image.height()) + zlib.compress(pixels, 1)
+    if len(data) > disk_cache_capacity():
+        return
+    temporary_path = None
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=directory, suffix=_TEMPORARY_SUFFIX, delete=False) as file:
+            temporary_path = Path(file.name)
+            file.write(data)
+        os.replace(temporary_path, directory / _file_name(key))
+    except OSError:
+        # The image is not cached, without leaving a partially written file behind.
+        if temporary_path is not None:
+            _remove(temporary_path)
+        return
+    _evict(directory)
+
+
+def _remove(path: Path):
+    """Removes a file of the cache, if it still exists and it can be removed.
+
+    :param path: path of the file
+    """
+    with suppress(OSError):
+        path.unlink(missing_ok=True)
+
+
+def _evict(directory: Path):
+    """Removes the least recently used images until the total size of the cache
+    is within its capacity, as well as stale temporary files.
+    Other processes might be removing the same files at the same time.
+
+    :param directory: directory of the cache
+    """
+    try:
+        paths = list(directory.iterdir())
+    except OSError:
+        return
+    now = time.time()
+    entries = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if path.suffix == _SUFFIX:
+            entries.append((stat.st_mtime, stat.st_size, path))
+        elif path.suffix == _TEMPORARY_SUFFIX and now - stat.st_mtime > _STALE_TEMPORARY_AGE:
+            _remove(path)
+    total_size = sum(size for _, size, _ in entries)
+    capacity = disk_cache_capacity()
+    for _, size, path in sorted(entries):
+        if total_size <= capacity:
+            break
+        _remove(path)
+        total_size -= size
@@ -0,0 +1,361 @@
+"""Display lists: graphics compiled into a flat sequence of drawing commands.
+
+:meta private:
+"""
+
+import os
+from functools import _CacheInfo, lru_cache
+from typing import NamedTuple, Protocol
+
+from skia import Canvas, Matrix, Paint, Path, Picture, Rect, TextBlob
+
+# Maximum number of distinct paints (colors and antialiasing settings) kept in the cache.
+PAINT_CACHE_SIZE = 1024
+# Maximum number of (largest) opaque rectangles considered when culling occluded commands.
+MAX_OCCLUDERS = 16
+# Alpha component of an opaque ARGB color.
+_OPAQUE_ALPHA = 0xFF
+
+
+def occlusion_culling_enabled() -> bool:
+    """Checks whether occlusion culling is enabled.
+
+    :returns: True if the environment variable `PYTAMARO_OCCLUSION_CULLING` is set
+    """
+    return "PYTAMARO_OCCLUSION_CULLING" in os.environ
+
+
+def batching_enabled() -> bool:
+    """Checks whether consecutive commands with the same color are merged into a
+    single path (see DisplayList.batched()).
+
+    :returns: True if the environment variable `PYTAMARO_BATCHING` is set
+    """
+    return "PYTAMARO_BATCHING" in os.environ
+
+
+def text_blobs_enabled() -> bool:
+    """Checks whether texts are drawn as text blobs (using the glyph cache and the
+    text rasterization of Skia, and as text elements in SVG files) instead of as
+    outlines.
+
+    :returns: True if the environment variable `PYTAMARO_TEXT_BLOBS` is set
+    """
+    return "PYTAMARO_TEXT_BLOBS" in os.environ
+
+
+@lru_cache(maxsize=PAINT_CACHE_SIZE)
+def paint(argb: int, antialias: bool) -> Paint:
+    """Returns a paint that fills with a color, shared by all the commands that use
+    the same color and antialiasing setting.
+    The returned paint must not be modified.
+
+    :param argb: color, as an ARGB 32-bit word
+    :param antialias: whether to draw with antialiasing
+    :returns: the (shared) paint
+    """
+    return Paint(Color=argb, AntiAlias=antialias)
+
+
+def paint_cache_info() -> _CacheInfo:
+    """Returns statistics about the cache of paints (hits, misses, and size).
+
+    :returns: the statistics of the cache
+    """
+    return paint.cache_info()
+
+
+class Recorded(Protocol):
+    """A graphic drawn with its picture, recorded once for each text mode
+    (see text_blobs_enabled()).
+    """
+
+    @property
+    def picture(self) -> Picture:  # noqa: D102
+        ...
+
+
+class Shape(NamedTuple):
+    """A rectangle, an ellipse or a circular sector, which Skia can draw with a
+    specialized call instead of filling its path.
+    """
+
+    # The rectangle itself, or the rectangle in which the ellipse (or the circle of the
+    # sector) is inscribed.
+    rect: Rect
+    oval: bool
+    # Angle of a sector, in degrees, clockwise from the rightmost point of the circle.
+    sweep_angle: float = 360
+
+
+def _draw_shape(canvas: Canvas, shape: Shape, shape_paint: Paint):
+    """Draws a shape with the specialized call of Skia, which draws the same pixels
+    as filling its path.
+
+    :param canvas: canvas onto which to draw
+    :param shape: shape to draw
+    :param shape_paint: paint to fill the shape with
+    """
+    rect = shape.rect
+    if not shape.oval:
+        canvas.drawRect(rect, shape_paint)
+    elif shape.sweep_angle != 360:  # noqa: PLR2004
+        canvas.drawArc(rect, 0, shape.sweep_angle, True, shape_paint)
+    elif rect.width() == rect.height():
+        canvas.drawCircle(rect.centerX(), rect.centerY(), rect.width() / 2, shape_paint)
+    else:
+        canvas.drawOval(rect, shape_paint)
+
+
+class DisplayList:
+    """A flat sequence of drawing commands, that can be replayed onto any canvas.
+
+    Each command draws either a path with a color (an ARGB 32-bit word), or a recorded
+    graphic (with its picture in the text mode active when replaying), transformed by
+    an absolute matrix (relative to the graphic the display list was compiled from).
+    Commands that draw a text also keep a text blob, drawn instead of the path (its
+    outline) when text blobs are enabled.
+    Commands that draw a rectangle, an ellipse or a circular sector also keep its
+    shape, drawn with a specialized call when the transformation keeps rectangles
+    axis-aligned (which also produces compact SVG elements).
+    Commands are stored in parallel lists, in drawing order, so that replaying
+    them does not need to traverse the tree that represents the graphic.
+    """
+
+    __slots__ = (
+        "matrices",
+        "paths",
+        "recorded",
+        "blobs",
+        "shapes",
+        "colors",
+        "antialias",
+        "opaque_rects",
+        "_batched",
+        "_culled",
+    )
+
+    def __init__(self):  # noqa: D107
+        self.matrices: list[Matrix] = []
+        # Each command draws either a path or a recorded graphic (the other one is None).
+        self.paths: list[Path | None] = []
+        self.recorded: list[Recorded | None] = []
+        self.blobs: list[TextBlob | None] = []
+        self.shapes: list[Shape | None] = []
+        self.colors: list[int] = []
+        self.antialias: list[bool] = []
+        # Area that each command completely covers with an opaque color, when it is an
+        # axis-aligned rectangle (None otherwise).
+        self.opaque_rects: list[Rect | None] = []
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.paths)
+
+    def add_path(
+        self,
+        matrix: Matrix,
+        path: Path,
+        color: int,
+        antialias: bool,
+        shape: Shape | None = None,
+    ):
+        """Appends a command that draws a path.
+
+        :param matrix: transformation to apply to the path
+        :param path: path to draw
+        :param color: color to fill the path with, as an ARGB 32-bit word
+        :param antialias: whether to draw the path with antialiasing
+        :param shape: shape that the path outlines, when it is a rectangle, an ellipse
+                      or a circular sector
+        """
+        self.matrices.append(matrix)
+        self.paths.append(path)
+        self.recorded.append(None)
+        self.blobs.append(None)
+        self.shapes.append(shape)
+        self.colors.append(color)
+        self.antialias.append(antialias)
+        # An opaque rectangle that stays axis-aligned completely covers its area.
+        opaque_rect = None
+        opaque = color >> 24 == _OPAQUE_ALPHA
+        if shape is not None and not shape.oval and opaque and matrix.rectStaysRect():
+            opaque_rect = matrix.mapRect(shape.rect)
+        self.opaque_rects.append(opaque_rect)
+
+    def add_text(self, matrix: Matrix, path: Path, blob: TextBlob | None, color: int):
+        """Appends a command that draws a text (always with antialiasing).
+
+        :param matrix: transformation to apply to the text
+        :param path: outline of the text, which determines the bounds of the command
+        :param blob: text blob that draws the same text, or None if there is none
+                     (e.g., for an empty text)
+        :param color: color to fill the text with, as an ARGB 32-bit word
+        """
+        self.matrices.append(matrix)
+        self.paths.append(path)
+        self.recorded.append(None)
+        self.blobs.append(blob)
+        self.shapes.append(None)
+        self.colors.append(color)
+        self.antialias.append(True)
+        self.opaque_rects.append(None)
+
+    def add_picture(self, matrix: Matrix, recorded: Recorded):
+        """Appends a command that draws the picture of a graphic.
+        The picture is only looked up when replaying, so that it is recorded in the
+        text mode active at that time.
+
+        :param matrix: transformation to apply to the picture
+        :param recorded: graphic to draw with its picture
+        """
+        self.matrices.append(matrix)
+        self.paths.append(None)
+        self.recorded.append(recorded)
+        self.blobs.append(None)
+        self.shapes.append(None)
+        # A picture has no color of its own, and it might contain antialiased paths.
+        self.colors.append(0)
+        self.antialias.append(True)
+        self.opaque_rects.append(None)
+
+    def copy_command(self, display_list: "DisplayList", index: int):
+        """Appends a command of another display list.
+
+        :param display_list: display list that contains the command
+        :param index: index of the command
+        """
+        self.matrices.append(display_list.matrices[index])
+        self.paths.append(display_list.paths[index])
+        self.recorded.append(display_list.recorded[index])
+        self.blobs.append(display_list.blobs[index])
+        self.shapes.append(display_list.shapes[index])
+        self.colors.append(display_list.colors[index])
+        self.antialias.append(display_list.antialias[index])
+        self.opaque_rects.append(display_list.opaque_rects[index])
+
+    def bounds(self, index: int) -> Rect:
+        """Computes the bounds of the path (or picture) drawn by a command,
+        once transformed.
+
+        :param index: index of the command
+        :returns: the bounds of the transformed path (or picture)
+        """
+        path, recorded = self.paths[index], self.recorded[index]
+        bounds = recorded.picture.cullRect() if recorded is not None else path.getBounds()  # type: ignore
+        return self.matrices[index].mapRect(bounds)
+
+    def culled(self) -> "DisplayList":
+        """Returns a display list without the commands that are completely hidden
+        by later opaque rectangles, which would draw the same pixels.
+
+        Only the largest opaque rectangles (up to `MAX_OCCLUDERS`) are considered,
+        to keep the cost linear in the number of commands.
+        With antialiasing, a path can partially cover the pixels around its bounds:
+        those commands are removed only when they are hidden with a margin.
+        The result is computed once and then kept.
+
+        :returns: the culled display list
+        """
+        try:
+            return self._culled
+        except AttributeError:
+            pass
+        # Opaque rectangles drawn after the current command, as (area, rectangle) pairs.
+        occluders: list[tuple[float, Rect]] = []
+        visible: list[int] = []
+        for index in reversed(range(len(self))):
+            bounds = self.bounds(index)
+            if self.antialias[index]:
+                bounds = bounds.makeOutset(1, 1)
+            if any(occluder.contains(bounds) for _, occluder in occluders):
+                continue
+            visible.append(index)
+            opaque_rect = self.opaque_rects[index]
+            if opaque_rect is not None and not opaque_rect.isEmpty():
+                occluders.append((opaque_rect.width() * opaque_rect.height(), opaque_rect))
+                if len(occluders) > MAX_OCCLUDERS:
+                    occluders.sort(key=lambda occluder: occluder[0], reverse=True)
+                    occluders.pop()
+        culled = DisplayList()
+        for index in reversed(visible):
+            culled.copy_command(self, index)
+        self._culled = culled
+        return culled
+
+    def batched(self) -> "DisplayList":
+        """Returns a display list that draws (almost) the same pixels with fewer
+        commands, by merging runs of consecutive commands with the same color into a
+        single path.
+
+        Only commands drawn without antialiasing are merged (with antialiasing, two
+        disjoint paths can still partially cover the same pixel), and only when they do
+        not overlap the commands already in the batch (overlapping parts would be
+        blended twice with translucent colors, and overlapping contours with opposite
+        directions would cancel each other out in the merged path).
+        The transformation of each command is applied to the points of its path, which
+        are then transformed again by the canvas: rounding twice can move edges by a
+        pixel (e.g., in rotated boards with fractional sizes), so batching is opt-in.
+        The result is computed once and then kept.
+
+        :returns: the batched display list
+        """
+        try:
+            return self._batched
+        except AttributeError:
+            pass
+        batched = DisplayList()
+        start = 0
+        while start < len(self):
+            color = self.colors[start]
+            end = start + 1
+            if not self.antialias[start]:
+                batch_bounds = self.bounds(start)
+                while (
+                    end < len(self)
+                    and self.colors[end] == color
+                    and not self.antialias[end]
+                    and not batch_bounds.intersects(bounds := self.bounds(end))
+                ):
+                    batch_bounds.join(bounds)
+                    end += 1
+            if end - start == 1:
+                batched.copy_command(self, start)
+            else:
+                path = Path()
+                for index in range(start, end):
+                    path.addPath(self.paths[index], self.matrices[index])  # type: ignore
+                batched.add_path(Matrix(), path, color, False)
+            start = end
+        self._batched = batched
+        return batched
+
+    def replay(self, canvas: Canvas):
+        """Draws the commands onto a canvas, on top of its current transformation.
+
+        :param canvas: canvas onto which to draw
+        """
+        base_matrix = canvas.getTotalMatrix()
+        text_blobs = text_blobs_enabled()
+        canvas.save()
+        for matrix, path, recorded, blob, shape, color, antialias in zip(
+            self.matrices,
+            self.paths,
+            self.recorded,
+            self.blobs,
+            self.shapes,
+            self.colors,
+            self.antialias,
+            strict=True,
+        ):
+            total_matrix = Matrix.Concat(base_matrix, matrix)
+            canvas.setMatrix(total_matrix)
+            if recorded is not None:
+                canvas.drawPicture(recorded.picture)
+            elif blob is not None and text_blobs:
+                # The text blob is laid out on the baseline, like the outline.
+                canvas.drawTextBlob(blob, 0, 0, paint(color, antialias))
+            elif shape is not None and total_matrix.rectStaysRect():
+                _draw_shape(canvas, shape, paint(color, antialias))
+            else:
+                canvas.drawPath(path, paint(color, antialias))
+        canvas.restore()
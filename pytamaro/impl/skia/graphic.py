@@ -4,12 +4,30 @@
 """
 
 # ruff: noqa: D101, D102,  D105, D107
+import math
 import sys
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from functools import cached_property
-
-from skia import Canvas, Color4f, Font, FontMgr, Matrix, Paint, Path, Point, Rect, Size, Typeface
+from abc import ABC
+from collections.abc import Callable, Container, Iterator
+from dataclasses import FrozenInstanceError, fields
+from functools import lru_cache
+from hashlib import sha256
+from typing import Any, NamedTuple, TypeVar
+
+from skia import (
+    Canvas,
+    Color4f,
+    Font,
+    FontMgr,
+    Matrix,
+    Path,
+    Picture,
+    PictureRecorder,
+    Point,
+    Rect,
+    Size,
+    TextBlob,
+    Typeface,
+)
 
 from pytamaro.color import Color
 from pytamaro.graphic import (
@@ -27,15 +45,296 @@ from pytamaro.graphic import (
     Text,
     Triangle,
 )
+from pytamaro.impl.geometry import (
+    Coordinates,
+    Hull,
+    circular_sector_hull,
+    convex_hull,
+    curve_hull_points,
+    ellipse_hull,
+    hull_bounds,
+    merge_hulls,
+    rectangle_hull,
+    rotate_hull,
+    triangle_hull,
+)
+from pytamaro.impl.skia.display_list import (
+    PAINT_CACHE_SIZE,
+    DisplayList,
+    Shape,
+    batching_enabled,
+    occlusion_culling_enabled,
+    text_blobs_enabled,
+)
 from pytamaro.localization import translate
 from pytamaro.point import Point as PyTamaroPoint
 from pytamaro.point_names import bottom_center, center, center_left, center_right, top_center
+from pytamaro.utils import Spec
+
+# Maximum number of typefaces and fonts kept by the font caches.
+FONT_CACHE_SIZE = 256
+# Maximum number of glyph outlines and laid out texts kept by the text caches.
+GLYPH_CACHE_SIZE = 4096
+TEXT_LAYOUT_CACHE_SIZE = 1024
+
+_BEZIER_VERBS = (Path.Verb.kQuad_Verb, Path.Verb.kCubic_Verb)
+
+
+T = TypeVar("T", bound=type)
+
+
+def _implements(public_class: type[Graphic]) -> Callable[[T], T]:
+    """Class decorator that makes a Skia graphic an implementation of a public graphic
+    class, without inheriting its (dataclass) layout.
+
+    The Skia class is registered as a virtual subclass of the public one (so that
+    `isinstance` checks keep working), and SkiaGraphic delegates to it the methods
+    that only depend on the public fields: equality, hashing, representation and spec.
+
+    :param public_class: public graphic class implemented by the decorated class
+    :returns: the class decorator
+    """
+
+    def decorator(cls: T) -> T:
+        cls.public_class = public_class
+        public_class.register(cls)
+        return cls
+
+    return decorator
+
+
+def _path_hull(path: Path) -> Hull:
+    """Computes a convex hull that encloses a path, from the control points of its
+    curves (see `curve_hull_points()`).
+    Conics are enclosed by their control points (as their weights are positive),
+    without splitting them.
+
+    :param path: path whose hull is computed
+    :returns: the convex hull of the path
+    """
+    points: list[Coordinates] = []
+    iterator = Path.Iter(path, False)
+    verb, verb_points = iterator.next()
+    while verb != Path.Verb.kDone_Verb:
+        control_points = [(point.x(), point.y()) for point in verb_points]
+        if verb in _BEZIER_VERBS:
+            points.extend(curve_hull_points(control_points))
+        else:
+            points.extend(control_points)
+        verb, verb_points = iterator.next()
+    return convex_hull(points)
+
+
+@lru_cache(maxsize=PAINT_CACHE_SIZE)
+def _skia_color(color: Color) -> Color4f:
+    """Converts a color to its Skia representation, sharing it among all the graphics
+    with the same color.
+
+    :param color: color to convert
+    :returns: the Skia color
+    """
+    return Color4f(color.red / 255, color.green / 255, color.blue / 255, color.alpha)
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _typeface(font_name: str) -> Typeface:
+    """Looks up the typeface of a font family, sharing it among all the texts that
+    use the same family.
+    Missing families are cached as well, so that the warning is printed only once.
+
+    :param font_name: name of the font family
+    :returns: the typeface (the default one if the family is not found)
+    """
+    if FontMgr().matchFamily(font_name).count() == 0:
+        print(translate("FONT_NOT_FOUND", font_name), file=sys.stderr)
+    return Typeface(font_name)
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _font(font_name: str, text_size: float) -> Font:
+    """Creates a Skia font, sharing it among all the texts with the same font family
+    and size.
+
+    :param font_name: name of the font family
+    :param text_size: size of the text, in points
+    :returns: the font
+    """
+    return Font(_typeface(font_name), text_size)
+
+
+@lru_cache(maxsize=GLYPH_CACHE_SIZE)
+def _glyph_path(font_name: str, text_size: float, glyph: int) -> Path | None:
+    """Computes the outline of a glyph, sharing it among all the texts that use it.
+    The returned path must not be modified.
+
+    :param font_name: name of the font family
+    :param text_size: size of the text, in points
+    :param glyph: identifier of the glyph in the typeface
+    :returns: the outline of the glyph, or None if it has no outline (e.g., a space)
+    """
+    return _font(font_name, text_size).getPath(glyph)
+
+
+class _TextLayout(NamedTuple):
+    """Outline of a text laid out on the baseline, with its bounds (including
+    leading and trailing glyphs with no outline) and the tight bounds of its outline.
+    """
+
+    path: Path
+    bounds: Rect
+    outline_bounds: Rect
+
+
+@lru_cache(maxsize=TEXT_LAYOUT_CACHE_SIZE)
+def _text_layout(text: str, font_name: str, text_size: float) -> _TextLayout:
+    """Lays out the glyphs of a text on the baseline, sharing the resulting outline
+    (with its bounds) among all the texts with the same string, font family and size.
+    The returned path must not be modified.
+
+    :param text: text to lay out
+    :param font_name: name of the font family
+    :param text_size: size of the text, in points
+    :returns: the layout of the text
+    """
+    font = _font(font_name, text_size)
+    glyphs = font.textToGlyphs(text)
+    offsets = font.getXPos(glyphs)
+    text_path = Path()
+    for glyph, x_offset in zip(glyphs, offsets, strict=True):
+        path = _glyph_path(font_name, text_size, glyph)
+        if path is not None:
+            text_path.addPath(path, x_offset, 0)
+    # The width is determined by Font.measureText() to account for leading and
+    # trailing glyphs with no outline.
+    path_bounds = text_path.computeTightBounds()
+    bounds = Rect.MakeLTRB(0, path_bounds.top(), font.measureText(text), path_bounds.bottom())
+    return _TextLayout(text_path, bounds, path_bounds)
+
+
+@lru_cache(maxsize=TEXT_LAYOUT_CACHE_SIZE)
+def _text_hull(text: str, font_name: str, text_size: float) -> Hull:
+    """Computes the hull of the outline of a text laid out on the baseline, sharing it
+    among all the texts with the same string, font family and size.
+
+    :param text: text to lay out
+    :param font_name: name of the font family
+    :param text_size: size of the text, in points
+    :returns: the hull of the text
+    """
+    return _path_hull(_text_layout(text, font_name, text_size).path)
+
+
+@lru_cache(maxsize=TEXT_LAYOUT_CACHE_SIZE)
+def _text_blob(text: str, font_name: str, text_size: float) -> TextBlob | None:
+    """Creates a text blob that draws a text on the baseline, sharing it among all the
+    texts with the same string, font family and size.
+
+    :param text: text to draw
+    :param font_name: name of the font family
+    :param text_size: size of the text, in points
+    :returns: the text blob, or None for an empty text
+    """
+    return TextBlob.MakeFromString(text, _font(font_name, text_size))
+
+
+@lru_cache(maxsize=PAINT_CACHE_SIZE)
+def _argb(color: Color) -> int:
+    """Converts a color to an ARGB 32-bit word, as used by Skia to draw.
+
+    :param color: color to convert
+    :returns: the ARGB word
+    """
+    return _skia_color(color).toColor()
+
+
+def _digest_value(value: Any) -> bytes:
+    """Encodes a field of a graphic (other than a graphic) for its digest.
+    Numbers keep their type (e.g., 10 and 10.0 are encoded differently).
+
+    :param value: value of the field
+    :returns: the encoded value
+    """
+    if isinstance(value, Color):
+        value = (value.red, value.green, value.blue, value.alpha)
+    elif isinstance(value, PyTamaroPoint):
+        value = (value.x, value.y)
+    return repr(value).encode()
+
+
+def _union(rect1: Rect, rect2: Rect) -> Rect:
+    """Computes the smallest rectangle that contains both rectangles.
+    Unlike Rect.join(), degenerate rectangles (with no width or height) are not ignored.
+
+    :param rect1: first rectangle
+    :param rect2: second rectangle
+    :returns: the union of the two rectangles
+    """
+    return Rect.MakeLTRB(
+        min(rect1.left(), rect2.left()),
+        min(rect1.top(), rect2.top()),
+        max(rect1.right(), rect2.right()),
+        max(rect1.bottom(), rect2.bottom()),
+    )
 
 
-@dataclass(frozen=True, eq=False)
 class SkiaGraphic(Graphic, ABC):
+    """Base class of the Skia implementation of graphics.
+
+    Graphics are immutable nodes of a tree, with a compact layout (using slots) that
+    also hosts the caches. Each node keeps its pinning position, its bounds and
+    whether it has an outline. Operations also keep the convex hull of their outline
+    (merged from the hulls of their components, or shared with them), so that
+    rotating a graphic only costs as much as its hull; primitives compute it when it
+    is needed, sharing it with the equal primitives.
+    """
+
+    __slots__ = (
+        "pin_position",
+        "bounds",
+        "_outlined",
+        "_hull",
+        "_path",
+        "_display_list",
+        "_pictures",
+        "_digest",
+        "_spec_with_deps",
+        "__weakref__",
+    )
+
+    # Public class implemented by this class (see _implements()).
+    public_class: type[Graphic]
+
     pin_position: Point
-    path: Path
+    bounds: Rect
+
+    def __init__(self, pin_position: Point, bounds: Rect, outlined: bool):
+        object.__setattr__(self, "pin_position", pin_position)
+        object.__setattr__(self, "bounds", bounds)
+        object.__setattr__(self, "_outlined", outlined)
+
+    def __setattr__(self, name: str, value: Any):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other: object) -> bool:  # noqa: D105
+        return self.public_class.__eq__(self, other)
+
+    def __hash__(self) -> int:  # noqa: D105
+        return self.public_class.__hash__(self)
+
+    def __repr__(self) -> str:  # noqa: D105
+        return self.public_class.__repr__(self)
+
+    def spec_with_deps(self) -> tuple[Spec, list[Graphic]]:  # noqa: D102
+        return self.public_class.spec_with_deps(self)
+
+    def __setstate__(self, state: tuple[None, dict[str, Any]]):
+        """Restores the slots of a copied graphic, which cannot be assigned as usual."""
+        _, slots = state
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
 
     def size(self) -> Size:
         """Computes the size of this graphic (x and y axes spanning),
@@ -45,14 +344,207 @@ class SkiaGraphic(Graphic, ABC):
         """
         return Size(self.bounds.width(), self.bounds.height())
 
-    @cached_property
-    def bounds(self) -> Rect:
-        """Computes the (tight) bounds for the path (outline) of this graphic.
+    @property
+    def path(self) -> Path:
+        """The path (outline) of this graphic, flattening the outlines of
+        all the graphics it is made of.
+        Composite graphics only keep references to their components, so this
+        (potentially large) path is built only when it is actually needed.
+        """
+        try:
+            return self._path
+        except AttributeError:
+            path = self._flatten_path()
+            object.__setattr__(self, "_path", path)
+            return path
 
-        :returns: a rectangle that indicates the bounds of the graphic in the 2D
-                  space
+    def _flatten_path(self) -> Path:
+        """Builds the path of this graphic from the paths of the primitives it is made of.
+
+        :returns: the path of the graphic
         """
-        return self.path.computeTightBounds()
+        path = Path()
+        for leaf, matrix in self.leaves():
+            path.addPath(leaf.path, matrix)
+        return path
+
+    @property
+    def hull(self) -> Hull:
+        """The convex hull of the outline of this graphic, which encloses it
+        (exceeding curves by at most a small tolerance).
+        Operations keep it from their construction, so it is only computed here
+        (and then kept) for primitives.
+        """
+        try:
+            return self._hull
+        except AttributeError:
+            hull = self.combine_hulls([component.hull for component, _ in self.components()])
+            object.__setattr__(self, "_hull", hull)
+            return hull
+
+    def combine_hulls(self, hulls: list[Hull]) -> Hull:
+        """Computes the convex hull of the outline of this graphic from the hulls of
+        the graphics it is directly made of.
+
+        :param hulls: hulls of the components of this graphic (see components())
+        :returns: the convex hull of the graphic
+        """
+        return hulls[0]
+
+    @property
+    def display_list(self) -> DisplayList:
+        """The display list of this graphic: the commands that draw the primitives
+        it is made of, with their absolute transformations.
+        It is compiled once, so that rendering the same graphic again (e.g., at a
+        different size or in a different format) does not traverse its tree.
+        Composite graphics that appear more than once (the same object, reused)
+        are drawn with their picture, instead of repeating their commands.
+        """
+        try:
+            return self._display_list
+        except AttributeError:
+            display_list = DisplayList()
+            shared = self.shared_composites()
+            for leaf, matrix in self.leaves(shared):
+                if id(leaf) in shared:
+                    display_list.add_picture(matrix, leaf)
+                else:
+                    leaf.record(display_list, matrix)
+            object.__setattr__(self, "_display_list", display_list)
+            return display_list
+
+    @property
+    def picture(self) -> Picture:
+        """The drawing of this graphic, recorded into a Skia picture, that can be
+        replayed by Skia (e.g., each time the graphic appears in a larger graphic)
+        without going through its display list again.
+        Texts are drawn either as outlines or as text blobs (see text_blobs_enabled()),
+        so a picture is recorded (and kept) for each text mode.
+        """
+        text_blobs = text_blobs_enabled()
+        try:
+            pictures = self._pictures
+        except AttributeError:
+            pictures: dict[bool, Picture] = {}
+            object.__setattr__(self, "_pictures", pictures)
+        try:
+            return pictures[text_blobs]
+        except KeyError:
+            recorder = PictureRecorder()
+            # Slightly larger than the bounds, so that no antialiased pixel is culled.
+            canvas = recorder.beginRecording(self.bounds.makeOutset(1, 1))
+            self.display_list.replay(canvas)
+            picture = recorder.finishRecordingAsPicture()
+            pictures[text_blobs] = picture
+            return picture
+
+    @property
+    def digest(self) -> bytes:
+        """A structural digest (SHA-256) of this graphic, computed from its public
+        fields: equal graphics (whose numbers also have the same types) have the same
+        digest, in any process.
+        It is computed once, and it reuses the digests of the graphics it is made of.
+        """
+        try:
+            return self._digest
+        except AttributeError:
+            pass
+        # Compute the digests of the components first, without recursion.
+        to_visit: list[SkiaGraphic] = [self]
+        while len(to_visit) > 0:
+            graphic = to_visit[-1]
+            values = [getattr(graphic, field.name) for field in fields(graphic.public_class)]
+            missing = [
+                value
+                for value in values
+                if isinstance(value, SkiaGraphic) and not hasattr(value, "_digest")
+            ]
+            if len(missing) > 0:
+                to_visit.extend(missing)
+                continue
+            to_visit.pop()
+            hasher = sha256(graphic.public_class.__name__.encode())
+            for value in values:
+                hasher.update(b"\0")
+                if isinstance(value, SkiaGraphic):
+                    hasher.update(value._digest)
+                else:
+                    hasher.update(_digest_value(value))
+            object.__setattr__(graphic, "_digest", hasher.digest())
+        return self._digest
+
+    def shared_composites(self) -> set[int]:
+        """Finds the composite graphics that appear more than once in this graphic,
+        because the same object is used as a component more than once.
+
+        :returns: the identities (see id()) of the shared composite graphics
+        """
+        references: dict[int, int] = {}
+        composites: set[int] = set()
+        # Visit each graphic once, even when it is reused.
+        to_visit: list[SkiaGraphic] = [self]
+        while len(to_visit) > 0:
+            graphic = to_visit.pop()
+            for component, _ in graphic.components():
+                identity = id(component)
+                if identity not in references:
+                    references[identity] = 0
+                    if len(component.components()) > 0:
+                        composites.add(identity)
+                    to_visit.append(component)
+                references[identity] += 1
+        return {identity for identity in composites if references[identity] > 1}
+
+    def leaves(self, stop_at: Container[int] = ()) -> Iterator[tuple["SkiaGraphic", Matrix]]:
+        """Yields the graphics that are not made of other graphics (primitives and empty
+        graphics) this graphic is made of, in drawing order, each with the
+        transformation that places it in this graphic.
+
+        :param stop_at: identities (see id()) of graphics to yield as they are, without
+                       visiting the graphics they are made of
+        :returns: an iterator over the leaves and their transformations
+        """
+        # Traverse the components without recursion, as the tree can be deeply nested.
+        to_visit: list[tuple[SkiaGraphic, Matrix]] = [(self, Matrix())]
+        while len(to_visit) > 0:
+            graphic, matrix = to_visit.pop()
+            if id(graphic) in stop_at:
+                yield graphic, matrix
+                continue
+            components = graphic.components()
+            if len(components) == 0:
+                yield graphic, matrix
+            for component, component_matrix in reversed(components):
+                if component_matrix is None:
+                    to_visit.append((component, matrix))
+                else:
+                    to_visit.append((component, Matrix.Concat(matrix, component_matrix)))
+
+    def outline_bounds(self) -> Rect:
+        """Returns the (tight) bounds of the outline of this graphic, which determine
+        the bounds of the graphics it is part of.
+        They only differ from `bounds` for texts, whose bounds also span leading and
+        trailing glyphs with no outline.
+
+        :returns: the bounds of the outline of the graphic
+        """
+        return self.bounds
+
+    def has_outline(self) -> bool:
+        """Returns whether this graphic has an outline, i.e., it is not only made of
+        empty graphics (or, for example, of text with only spaces).
+
+        :returns: True if the graphic has an outline, False otherwise
+        """
+        return self._outlined
+
+    def components(self) -> list[tuple["SkiaGraphic", Matrix | None]]:
+        """Returns the graphics this graphic is directly made of, in drawing order,
+        each with the transformation to apply to it (None when there is none).
+
+        :returns: the components of the graphic, empty for primitive graphics
+        """
+        return []
 
     def zero_pixels(self) -> bool:
         """Returns whether this graphic has no pixels to render, because its (rounded) area is 0.
@@ -61,83 +553,138 @@ class SkiaGraphic(Graphic, ABC):
         """
         return self.size().toRound().isEmpty()
 
-    @abstractmethod
     def draw(self, canvas: Canvas):
-        """Draws the current graphic onto the provided canvas.
+        """Draws the current graphic onto the provided canvas, by replaying its
+        display list.
+        When occlusion culling is enabled, the commands hidden by later opaque
+        rectangles are skipped; when batching is enabled, consecutive commands with
+        the same color are merged.
 
         :param canvas: canvas onto which to draw
         """
+        display_list = self.display_list
+        if occlusion_culling_enabled():
+            display_list = display_list.culled()
+        if batching_enabled():
+            display_list = display_list.batched()
+        display_list.replay(canvas)
+
+    def record(self, display_list: DisplayList, matrix: Matrix):
+        """Appends to a display list the commands that draw this graphic, when it is
+        not made of other graphics.
+
+        :param display_list: display list to extend
+        :param matrix: transformation that places this graphic
+        """
 
 
-@dataclass(frozen=True, eq=False)
 class SkiaPrimitive(SkiaGraphic):
     """Represents a primitive graphic, which has a uniform color.
     Geometric shapes and text are primitive graphics.
     """
 
+    __slots__ = ("color",)
+
     color: Color
+    # Whether the graphic should be drawn with antialiasing.
+    antialias = False
 
     def __init__(self, path: Path, color: Color, pin_position: Point | None = None):
         object.__setattr__(self, "color", color)
+        object.__setattr__(self, "_path", path)
+        bounds = self.primitive_bounds()
         if pin_position is None:
-            bounds = path.computeTightBounds()
             pin_position = Point(bounds.width() / 2, bounds.height() / 2)
-        super().__init__(pin_position, path)
+        super().__init__(pin_position, bounds, not path.isEmpty())
 
-    @cached_property
-    def antialias(self) -> bool:
-        """Whether the graphic should be drawn with antialiasing."""
-        return False
+    def primitive_bounds(self) -> Rect:
+        """Computes the (tight) bounds for the path (outline) of this primitive.
+        Primitives whose bounds are known in closed form override this method,
+        to avoid walking the verbs of their path.
 
-    @cached_property
+        :returns: a rectangle that indicates the bounds of the graphic in the 2D
+                  space
+        """
+        return self.path.computeTightBounds()
+
+    def primitive_hull(self) -> Hull:
+        """Computes a convex hull that encloses the path (outline) of this primitive.
+        Primitives whose hull is known in closed form override this method.
+
+        :returns: the convex hull of the graphic
+        """
+        return _path_hull(self.path)
+
+    def combine_hulls(self, hulls: list[Hull]) -> Hull:
+        return self.primitive_hull()
+
+    @property
     def skia_color(self) -> Color4f:
-        """Returns the Skia color representation of this graphic."""
-        return Color4f(
-            self.color.red / 255, self.color.green / 255, self.color.blue / 255, self.color.alpha
-        )
+        """The Skia color representation of this graphic."""
+        return _skia_color(self.color)
+
+    def record(self, display_list: DisplayList, matrix: Matrix):
+        display_list.add_path(matrix, self.path, _argb(self.color), self.antialias)
 
-    def draw(self, canvas: Canvas):
-        canvas.drawPath(self.path, Paint(Color=self.skia_color, AntiAlias=self.antialias))
 
+@_implements(Empty)
+class SkiaEmpty(SkiaGraphic):
+    __slots__ = ()
 
-@dataclass(frozen=True, eq=False)
-class SkiaEmpty(SkiaGraphic, Empty):
     def __init__(self):
-        super().__init__(Point(0, 0), Path())
+        object.__setattr__(self, "_path", Path())
+        super().__init__(Point(0, 0), Rect.MakeEmpty(), False)
 
-    def draw(self, canvas: Canvas):
-        pass
+    def combine_hulls(self, hulls: list[Hull]) -> Hull:
+        return ()
 
-    def __repr__(self) -> str:
-        return Empty.__repr__(self)
 
+@_implements(Rectangle)
+class SkiaRectangle(SkiaPrimitive):
+    __slots__ = ("width", "height")
 
-@dataclass(frozen=True, eq=False)
-class SkiaRectangle(SkiaPrimitive, Rectangle):
     def __init__(self, width: float, height: float, color: Color):
         object.__setattr__(self, "width", width)
         object.__setattr__(self, "height", height)
         path = Path().addRect(Rect.MakeWH(width, height))
         super().__init__(path, color)
 
-    def __repr__(self) -> str:
-        return Rectangle.__repr__(self)
+    def primitive_bounds(self) -> Rect:
+        return Rect.MakeWH(self.width, self.height)
+
+    def primitive_hull(self) -> Hull:
+        return rectangle_hull(self.width, self.height)
+
+    def record(self, display_list: DisplayList, matrix: Matrix):
+        shape = Shape(self.bounds, oval=False)
+        display_list.add_path(matrix, self.path, _argb(self.color), self.antialias, shape)
 
 
-@dataclass(frozen=True, eq=False)
-class SkiaEllipse(SkiaPrimitive, Ellipse):
+@_implements(Ellipse)
+class SkiaEllipse(SkiaPrimitive):
+    __slots__ = ("width", "height")
+
     def __init__(self, width: float, height: float, color: Color):
         object.__setattr__(self, "width", width)
         object.__setattr__(self, "height", height)
         path = Path().addOval(Rect.MakeWH(width, height))
         super().__init__(path, color)
 
-    def __repr__(self) -> str:
-        return Ellipse.__repr__(self)
+    def primitive_bounds(self) -> Rect:
+        return Rect.MakeWH(self.width, self.height)
+
+    def primitive_hull(self) -> Hull:
+        return ellipse_hull(self.width, self.height)
+
+    def record(self, display_list: DisplayList, matrix: Matrix):
+        shape = Shape(self.bounds, oval=True)
+        display_list.add_path(matrix, self.path, _argb(self.color), self.antialias, shape)
+
 
+@_implements(CircularSector)
+class SkiaCircularSector(SkiaPrimitive):
+    __slots__ = ("radius", "angle")
 
-@dataclass(frozen=True, eq=False)
-class SkiaCircularSector(SkiaPrimitive, CircularSector):
     def __init__(self, radius: float, angle: float, color: Color):
         object.__setattr__(self, "radius", radius)
         object.__setattr__(self, "angle", angle)
@@ -151,69 +698,109 @@ class SkiaCircularSector(SkiaPrimitive, CircularSector):
             path.close()
         super().__init__(path, color, Point(radius, radius))
 
-    def __repr__(self) -> str:
-        return CircularSector.__repr__(self)
-
+    def primitive_bounds(self) -> Rect:
+        """Computes the bounds of the sector from the center, the two ends of the arc
+        and the extreme points of the circle that the arc passes through.
+        """
+        radius = self.radius
+        if self.angle == 360:  # noqa: PLR2004
+            return Rect.MakeWH(2 * radius, 2 * radius)
+        # The arc goes counterclockwise from the rightmost point of the circle.
+        end_angle = math.radians(self.angle)
+        xs = [radius, 2 * radius, radius + radius * math.cos(end_angle)]
+        ys = [radius, radius, radius - radius * math.sin(end_angle)]
+        extreme_points = [(90, radius, 0), (180, 0, radius), (270, radius, 2 * radius)]
+        for angle, x, y in extreme_points:
+            if self.angle >= angle:
+                xs.append(x)
+                ys.append(y)
+        return Rect.MakeLTRB(min(xs), min(ys), max(xs), max(ys))
+
+    def primitive_hull(self) -> Hull:
+        return circular_sector_hull(self.radius, self.angle)
+
+    def record(self, display_list: DisplayList, matrix: Matrix):
+        diameter = 2 * self.radius
+        # Skia measures angles clockwise, and the sector goes counterclockwise.
+        sweep_angle = 360 if self.angle == 360 else -self.angle  # noqa: PLR2004
+        shape = Shape(Rect.MakeWH(diameter, diameter), oval=True, sweep_angle=sweep_angle)
+        display_list.add_path(matrix, self.path, _argb(self.color), self.antialias, shape)
+
+
+@_implements(Triangle)
+class SkiaTriangle(SkiaPrimitive):
+    __slots__ = ("side1", "side2", "angle", "third_point")
 
-@dataclass(frozen=True, eq=False)
-class SkiaTriangle(SkiaPrimitive, Triangle):
     def __init__(self, side1: float, side2: float, angle: float, color: Color):
         object.__setattr__(self, "side1", side1)
         object.__setattr__(self, "side2", side2)
         object.__setattr__(self, "angle", angle)
         third_point = Matrix.RotateDeg(-angle).mapXY(side2, 0)
+        object.__setattr__(self, "third_point", third_point)
         path = Path.Polygon([Point(0, 0), Point(side1, 0), third_point], isClosed=True)
         # The centroid is the average of the three vertices
         centroid = Point((side1 + third_point.x()) / 3, third_point.y() / 3)
         super().__init__(path, color, centroid)
 
-    def __repr__(self) -> str:
-        return Triangle.__repr__(self)
+    def primitive_bounds(self) -> Rect:
+        third_x, third_y = self.third_point.x(), self.third_point.y()  # type: ignore
+        return Rect.MakeLTRB(
+            min(0, third_x), min(0, third_y), max(self.side1, third_x), max(0, third_y)
+        )
+
+    def primitive_hull(self) -> Hull:
+        third_point = self.third_point  # type: ignore
+        return triangle_hull(self.side1, (third_point.x(), third_point.y()))
+
 
+@_implements(Text)
+class SkiaText(SkiaPrimitive):
+    __slots__ = ("text", "font_name", "text_size")
+
+    antialias = True
 
-@dataclass(frozen=True, eq=False)
-class SkiaText(SkiaPrimitive, Text):
     def __init__(self, text: str, font_name: str, text_size: float, color: Color):
         object.__setattr__(self, "text", text)
         object.__setattr__(self, "font_name", font_name)
         object.__setattr__(self, "text_size", text_size)
-        if FontMgr().matchFamily(font_name).count() == 0:
-            print(translate("FONT_NOT_FOUND", font_name), file=sys.stderr)
-        glyphs = self.font.textToGlyphs(text)
-        offsets = self.font.getXPos(glyphs)
-        text_path = Path()
-        for glyph, x_offset in zip(glyphs, offsets, strict=True):
-            path = self.font.getPath(glyph)
-            if path is not None:  # some glyphs (e.g., a space) have no outline
-                path.offset(x_offset, 0)
-                text_path.addPath(path)
         # The pinning position is on the left (0) on the baseline (0).
-        super().__init__(text_path, color, Point(0, 0))
-
-    @cached_property
-    def antialias(self) -> bool:
-        return True
+        super().__init__(self.layout.path, color, Point(0, 0))
 
-    @cached_property
+    @property
     def font(self) -> Font:
-        """The Skia Font used to render the text."""
-        return Font(Typeface(self.font_name), self.text_size)
+        """The Skia Font used to render the text, shared among all the texts with the
+        same font family and size.
+        """
+        return _font(self.font_name, self.text_size)
 
-    @cached_property
-    def bounds(self) -> Rect:
+    @property
+    def layout(self) -> _TextLayout:
+        """The layout of the text, shared among all the texts with the same string,
+        font family and size.
+        """
+        return _text_layout(self.text, self.font_name, self.text_size)
+
+    def primitive_bounds(self) -> Rect:
         """Computes the bounding box of the text, whose width is determined by
         Font.measureText() to account for leading and trailing glyphs with no outline.
         """
-        path_bounds = super().bounds
-        text_length = self.font.measureText(self.text)
-        return Rect.MakeLTRB(0, path_bounds.top(), text_length, path_bounds.bottom())
+        return self.layout.bounds
+
+    def primitive_hull(self) -> Hull:
+        return _text_hull(self.text, self.font_name, self.text_size)
+
+    def outline_bounds(self) -> Rect:
+        return self.layout.outline_bounds
 
-    def __repr__(self) -> str:
-        return Text.__repr__(self)
+    def record(self, display_list: DisplayList, matrix: Matrix):
+        blob = _text_blob(self.text, self.font_name, self.text_size)
+        display_list.add_text(matrix, self.path, blob, _argb(self.color))
 
 
-@dataclass(frozen=True, eq=False)
-class SkiaCompose(SkiaGraphic, Compose):
+@_implements(Compose)
+class SkiaCompose(SkiaGraphic):
+    __slots__ = ("foreground", "background", "offset")
+
     foreground: SkiaGraphic
     background: SkiaGraphic
 
@@ -223,28 +810,36 @@ class SkiaCompose(SkiaGraphic, Compose):
         fg_pin = self.foreground.pin_position
         bg_pin = self.background.pin_position
         pin = Point(bg_pin.x(), bg_pin.y())
-        path = Path(self.background.path)
-        path.addPath(self.foreground.path, bg_pin.x() - fg_pin.x(), bg_pin.y() - fg_pin.y())
-        super().__init__(pin, path)
-
-    def draw(self, canvas: Canvas):
-        canvas.save()
-        self.background.draw(canvas)
-        canvas.translate(
-            self.background.pin_position.x() - self.foreground.pin_position.x(),
-            self.background.pin_position.y() - self.foreground.pin_position.y(),
-        )
-        self.foreground.draw(canvas)
-        canvas.restore()
+        # Translation of the foreground that aligns the two pinning positions.
+        # Only this offset is kept: the outlines of the two graphics are not copied.
+        offset = Point(bg_pin.x() - fg_pin.x(), bg_pin.y() - fg_pin.y())
+        object.__setattr__(self, "offset", offset)
+        fg_bounds = self.foreground.outline_bounds().makeOffset(offset)
+        bg_bounds = self.background.outline_bounds()
+        if not self.foreground.has_outline():
+            bounds = bg_bounds
+        elif not self.background.has_outline():
+            bounds = fg_bounds
+        else:
+            bounds = _union(bg_bounds, fg_bounds)
+        outlined = self.foreground.has_outline() or self.background.has_outline()
+        super().__init__(pin, bounds, outlined)
+        hull = merge_hulls(background.hull, foreground.hull, offset.x(), offset.y())  # type: ignore
+        object.__setattr__(self, "_hull", hull)
 
-    def __repr__(self) -> str:
-        return Compose.__repr__(self)
+    def components(self) -> list[tuple[SkiaGraphic, Matrix | None]]:
+        return [
+            (self.background, None),
+            (self.foreground, Matrix.Translate(self.offset.x(), self.offset.y())),  # type: ignore
+        ]
 
 
-@dataclass(frozen=True, eq=False)
-class SkiaPin(SkiaGraphic, Pin):
+@_implements(Pin)
+class SkiaPin(SkiaGraphic):
     """Represents the pinning of a graphic in a certain position on its bounds."""
 
+    __slots__ = ("graphic", "pinning_point")
+
     graphic: SkiaGraphic
     pinning_point: PyTamaroPoint
 
@@ -255,17 +850,19 @@ class SkiaPin(SkiaGraphic, Pin):
         h_mapping = {-1.0: bounds.left(), 0.0: bounds.centerX(), 1.0: bounds.right()}
         v_mapping = {1.0: bounds.top(), 0.0: bounds.centerY(), -1.0: bounds.bottom()}
         pin = Point(h_mapping[pinning_point.x], v_mapping[pinning_point.y])
-        super().__init__(pin, graphic.path)
+        # The pinning position is on the bounds of the graphic, while the bounds of
+        # the pinned graphic are the ones of its outline (as for any composition).
+        super().__init__(pin, graphic.outline_bounds(), graphic.has_outline())
+        object.__setattr__(self, "_hull", graphic.hull)
 
-    def draw(self, canvas: Canvas):
-        self.graphic.draw(canvas)
+    def components(self) -> list[tuple[SkiaGraphic, Matrix | None]]:
+        return [(self.graphic, None)]
 
-    def __repr__(self) -> str:
-        return Pin.__repr__(self)
 
+@_implements(Rotate)
+class SkiaRotate(SkiaGraphic):
+    __slots__ = ("graphic", "angle", "rot_matrix")
 
-@dataclass(frozen=True, eq=False)
-class SkiaRotate(SkiaGraphic, Rotate):
     graphic: SkiaGraphic
 
     def __init__(self, graphic: SkiaGraphic, angle: float):
@@ -273,22 +870,22 @@ class SkiaRotate(SkiaGraphic, Rotate):
         object.__setattr__(self, "angle", angle)
         # Negated angle because RotateDeg works clockwise.
         object.__setattr__(self, "rot_matrix", Matrix.RotateDeg(-angle, graphic.pin_position))
-        path = Path()
-        # transform() mutates the path provided as the second argument
-        graphic.path.transform(self.rot_matrix, path)  # type: ignore
-        super().__init__(graphic.pin_position, path)
+        # Only the (small) convex hull is rotated to compute the new bounds,
+        # instead of the whole outline of the graphic.
+        pin = graphic.pin_position
+        hull = rotate_hull(graphic.hull, angle, (pin.x(), pin.y()))
+        bounds = Rect.MakeLTRB(*hull_bounds(hull)) if len(hull) > 0 else Rect.MakeEmpty()
+        super().__init__(pin, bounds, graphic.has_outline())
+        object.__setattr__(self, "_hull", hull)
 
-    def draw(self, canvas: Canvas):
-        canvas.save()
-        canvas.concat(self.rot_matrix)  # type: ignore
-        self.graphic.draw(canvas)
-        canvas.restore()
+    def combine_hulls(self, hulls: list[Hull]) -> Hull:
+        pin = self.pin_position
+        return rotate_hull(hulls[0], self.angle, (pin.x(), pin.y()))  # type: ignore
 
-    def __repr__(self) -> str:
-        return Rotate.__repr__(self)
+    def components(self) -> list[tuple[SkiaGraphic, Matrix | None]]:
+        return [(self.graphic, self.rot_matrix)]  # type: ignore
 
 
-@dataclass(frozen=True, eq=False)
 class SkiaSimpleCompose(SkiaGraphic, ABC):
     """Represents a simple composition operation between two graphics
     (i.e., beside, above, or overlay).
@@ -296,6 +893,8 @@ class SkiaSimpleCompose(SkiaGraphic, ABC):
     compose them normally, and then pin the result on its center.
     """
 
+    __slots__ = ("composed_graphic",)
+
     def __init__(
         self,
         graphic1: SkiaGraphic,
@@ -307,40 +906,40 @@ class SkiaSimpleCompose(SkiaGraphic, ABC):
             SkiaCompose(SkiaPin(graphic1, point1), SkiaPin(graphic2, point2)), center
         )
         object.__setattr__(self, "composed_graphic", composed_graphic)
-        super().__init__(composed_graphic.pin_position, composed_graphic.path)
+        super().__init__(
+            composed_graphic.pin_position, composed_graphic.bounds, composed_graphic.has_outline()
+        )
+        object.__setattr__(self, "_hull", composed_graphic.hull)
 
-    def draw(self, canvas: Canvas):
-        self.composed_graphic.draw(canvas)  # type: ignore
+    def components(self) -> list[tuple[SkiaGraphic, Matrix | None]]:
+        return [(self.composed_graphic, None)]  # type: ignore
 
 
-@dataclass(frozen=True, eq=False)
-class SkiaBeside(SkiaSimpleCompose, Beside):
+@_implements(Beside)
+class SkiaBeside(SkiaSimpleCompose):
+    __slots__ = ("left_graphic", "right_graphic")
+
     def __init__(self, left_graphic: SkiaGraphic, right_graphic: SkiaGraphic):
         object.__setattr__(self, "left_graphic", left_graphic)
         object.__setattr__(self, "right_graphic", right_graphic)
         super().__init__(left_graphic, right_graphic, center_right, center_left)
 
-    def __repr__(self) -> str:
-        return Beside.__repr__(self)
 
+@_implements(Above)
+class SkiaAbove(SkiaSimpleCompose):
+    __slots__ = ("top_graphic", "bottom_graphic")
 
-@dataclass(frozen=True, eq=False)
-class SkiaAbove(SkiaSimpleCompose, Above):
     def __init__(self, top_graphic: SkiaGraphic, bottom_graphic: SkiaGraphic):
         object.__setattr__(self, "top_graphic", top_graphic)
         object.__setattr__(self, "bottom_graphic", bottom_graphic)
         super().__init__(top_graphic, bottom_graphic, bottom_center, top_center)
 
-    def __repr__(self) -> str:
-        return Above.__repr__(self)
 
+@_implements(Overlay)
+class SkiaOverlay(SkiaSimpleCompose):
+    __slots__ = ("front_graphic", "back_graphic")
 
-@dataclass(frozen=True, eq=False)
-class SkiaOverlay(SkiaSimpleCompose, Overlay):
     def __init__(self, front_graphic: SkiaGraphic, back_graphic: SkiaGraphic):
         object.__setattr__(self, "front_graphic", front_graphic)
         object.__setattr__(self, "back_graphic", back_graphic)
         super().__init__(front_graphic, back_graphic, center, center)
-
-    def __repr__(self) -> str:
-        return Overlay.__repr__(self)
@@ -6,10 +6,14 @@
 # ruff: noqa: D103
 import base64
 import io
+import multiprocessing
 import os
 import re
 import subprocess
 import sys
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import cast
 
@@ -21,22 +25,87 @@ from skia import (
     FilterMode,
     Image,
     MipmapMode,
+    Picture,
+    PictureRecorder,
     Rect,
+    RTreeFactory,
     SamplingOptions,
     Surface,
     SVGCanvas,
     kPNG,
+    kPremul_AlphaType,
     kRGBA_8888_ColorType,
     kUnpremul_AlphaType,
 )
 
 from pytamaro.checks import area_message, check_graphic_size
 from pytamaro.graphic import Graphic
+from pytamaro.impl.ffi.specs import to_specs
+from pytamaro.impl.png import PNGWriter
 from pytamaro.impl.shared_io import guess_scaling_factor, print_data_uri
+from pytamaro.impl.skia import disk_cache
 from pytamaro.impl.skia.debug import add_debug_info
+from pytamaro.impl.skia.display_list import batching_enabled, text_blobs_enabled
 from pytamaro.impl.skia.graphic import SkiaGraphic
+from pytamaro.impl.skia.render_cache import RenderKey, render_cache
+from pytamaro.impl.skia.specs import graphic_from_specs
 from pytamaro.localization import translate
-from pytamaro.utils import ISize, Size, is_notebook
+from pytamaro.utils import ISize, Size, Spec, is_notebook
+
+# Side of the (square) tiles in which graphics too large for a single surface
+# (or rendered in parallel) are rendered, in pixels.
+TILE_SIZE = 1024
+# Minimum area (in pixels) of the graphics rendered in parallel: smaller graphics
+# are rendered faster by the current process than by starting a pool of processes.
+MIN_PARALLEL_AREA = 4 * TILE_SIZE * TILE_SIZE
+
+# State of a process that renders tiles (see _render_in_parallel()).
+_worker_state: dict[str, Picture] = {}
+
+
+def render_workers() -> int:
+    """Returns the number of processes that render large graphics in parallel.
+    Rendering in parallel is enabled by setting the environment variable
+    `PYTAMARO_RENDER_WORKERS` to the number of processes (or to any other value to
+    use one process per CPU).
+
+    The processes are forked from the current one (see `_process_pool()`): where
+    forking is not available (e.g., on Windows), graphics are rendered by the current
+    process only. Forking a process that runs several threads (e.g., a Jupyter
+    kernel) can deadlock, if another thread holds a lock while forking, and Python
+    warns about it from version 3.12: parallel rendering should only be enabled for
+    single-threaded programs.
+
+    :returns: the number of processes, 0 when rendering in parallel is not enabled
+    """
+    if (
+        "PYTAMARO_RENDER_WORKERS" not in os.environ
+        or "fork" not in multiprocessing.get_all_start_methods()
+    ):
+        return 0
+    workers = os.environ["PYTAMARO_RENDER_WORKERS"]
+    return int(workers) if workers.isdigit() else os.cpu_count() or 1
+
+
+def _process_pool(workers: int, initializer: Callable[..., None], *initargs) -> ProcessPoolExecutor:
+    """Creates a pool of processes that render graphics.
+
+    The processes are forked, whatever the default start method is (spawn on macOS,
+    forkserver on Linux from Python 3.14): the other start methods import the main
+    module again in each process, which runs the whole program again when it is not
+    guarded by `if __name__ == "__main__"` (as student programs usually are not).
+
+    :param workers: number of processes
+    :param initializer: function that initializes each process
+    :param initargs: arguments of the initializer
+    :returns: the pool of processes
+    """
+    return ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=initializer,
+        initargs=initargs,
+    )
 
 
 def graphic_size(graphic: Graphic) -> Size:
@@ -53,12 +122,7 @@ def _draw_to_canvas(canvas: Canvas, graphic: SkiaGraphic):
     """
     bounds = graphic.bounds
     canvas.translate(-bounds.left(), -bounds.top())
-    # Temporarily set the recursion limit to a high value so that we can
-    # traverse the (potentially deeply nested) tree that represents the graphic.
-    current_recursion_limit = sys.getrecursionlimit()
-    sys.setrecursionlimit(100000)
     graphic.draw(canvas)
-    sys.setrecursionlimit(current_recursion_limit)
 
 
 def _save_as_SVG(filename: str, graphic: SkiaGraphic):
@@ -98,6 +162,9 @@ def graphic_to_image(graphic: SkiaGraphic) -> Image:
         raise ValueError(
             area_message("TOO_LARGE_AREA_OUTPUT", skia_size.width(), skia_size.height())
         )
+    workers = render_workers()
+    if workers > 1 and width * height >= MIN_PARALLEL_AREA:
+        return _render_in_parallel(graphic, workers)
     scaling_factor = guess_scaling_factor(rounded_size)
     surface = Surface(width * scaling_factor, height * scaling_factor)
     surface.getCanvas().scale(scaling_factor, scaling_factor)
@@ -107,6 +174,103 @@ def graphic_to_image(graphic: SkiaGraphic) -> Image:
     )
 
 
+def _record_picture(graphic: SkiaGraphic) -> Picture:
+    """Records the drawing of a graphic (corrected for the top-left position) into
+    a Skia picture, which can be replayed onto several canvases.
+    The picture keeps an R-tree of its commands, so that replaying it onto a canvas
+    that only covers part of the graphic skips the commands outside of that part.
+
+    :param graphic: graphic to be recorded
+    :returns: the recorded picture
+    """
+    recorder = PictureRecorder()
+    canvas = recorder.beginRecording(Rect.MakeSize(graphic.size()), RTreeFactory()())
+    _draw_to_canvas(canvas, graphic)
+    return recorder.finishRecordingAsPicture()
+
+
+def _render_tile(picture: Picture, tile: Rect, scaling_factor: int) -> Image:
+    """Renders part of a recorded graphic into a Skia image.
+
+    :param picture: recorded graphic (see _record_picture())
+    :param tile: part of the graphic to be rendered, with integer coordinates
+    :param scaling_factor: scaling factor used for super-sampling
+    :returns: rendered part of the graphic as a Skia image
+    """
+    width, height = round(tile.width()), round(tile.height())
+    surface = Surface(width * scaling_factor, height * scaling_factor)
+    canvas = surface.getCanvas()
+    canvas.scale(scaling_factor, scaling_factor)
+    canvas.translate(-tile.left(), -tile.top())
+    canvas.drawPicture(picture)
+    return surface.makeImageSnapshot().resize(
+        width, height, SamplingOptions(FilterMode.kLinear, MipmapMode.kNearest)
+    )
+
+
+def _load_picture(data: bytes):
+    """Initializes a process that renders tiles with the picture to render.
+
+    :param data: serialized picture
+    """
+    _worker_state["picture"] = Picture.MakeFromData(data)
+
+
+def _render_tile_pixels(tile: tuple[int, int, int, int], scaling_factor: int) -> bytes:
+    """Renders a tile of the picture of the current process (see _load_picture()).
+
+    :param tile: left, top, width and height of the tile
+    :param scaling_factor: scaling factor used for super-sampling
+    :returns: the (premultiplied) RGBA values of the pixels of the tile
+    """
+    image = _render_tile(_worker_state["picture"], Rect.MakeXYWH(*tile), scaling_factor)
+    return image.convert(alphaType=kPremul_AlphaType, colorType=kRGBA_8888_ColorType).tobytes()
+
+
+def _render_in_parallel(graphic: SkiaGraphic, workers: int, tile_size: int = TILE_SIZE) -> Image:
+    """Renders a graphic into a Skia image, splitting it into tiles that are rendered
+    in parallel, each on its own surface, and then stitched together.
+
+    Tiles are rendered by a pool of processes (rather than threads) because
+    skia-python does not release the global interpreter lock while rasterizing.
+    Each process receives the graphic once, recorded into a serialized picture.
+
+    :param graphic: graphic to be rendered
+    :param workers: number of processes
+    :param tile_size: side of the tiles, in pixels
+    :returns: rendered graphic as a Skia image
+    """
+    width, height = graphic.size().toRound()
+    scaling_factor = guess_scaling_factor(ISize(width, height))
+    data = bytes(_record_picture(graphic).serialize())
+    tiles = [
+        (left, top, min(tile_size, width - left), min(tile_size, height - top))
+        for top in range(0, height, tile_size)
+        for left in range(0, width, tile_size)
+    ]
+    surface = Surface(width, height)
+    canvas = surface.getCanvas()
+    with _process_pool(workers, _load_picture, data) as executor:
+        all_pixels = executor.map(_render_tile_pixels, tiles, repeat(scaling_factor))
+        for (left, top, tile_width, tile_height), pixels in zip(tiles, all_pixels, strict=True):
+            tile_image = Image.frombytes(
+                pixels, (tile_width, tile_height), kRGBA_8888_ColorType, kPremul_AlphaType
+            )
+            canvas.drawImage(tile_image, left, top)
+    return surface.makeImageSnapshot()
+
+
+def _to_pillow_image(image: Image) -> PILImage:
+    """Converts a Skia image into a Pillow image.
+
+    :param image: Skia image to be converted
+    :returns: the Pillow image
+    """
+    return PILImageMod.fromarray(
+        image.convert(alphaType=kUnpremul_AlphaType, colorType=kRGBA_8888_ColorType)
+    )
+
+
 def graphic_to_pillow_image(graphic: Graphic) -> PILImage:
     """Renders a graphic and converts it into a Pillow image.
 
@@ -116,28 +280,150 @@ def graphic_to_pillow_image(graphic: Graphic) -> PILImage:
     rounded_size = graphic_size(graphic).to_round()
     check_graphic_size(rounded_size)
     graphic = cast(SkiaGraphic, graphic)
-    return PILImageMod.fromarray(
-        graphic_to_image(graphic).convert(
-            alphaType=kUnpremul_AlphaType, colorType=kRGBA_8888_ColorType
-        )
-    )
+    return _to_pillow_image(render_cached(graphic, False))
+
+
+def _render_key(graphic: SkiaGraphic, debug: bool) -> RenderKey:
+    """Computes the key that identifies the rendering of a graphic in the caches.
+
+    :param graphic: graphic to be rendered
+    :param debug: whether to add debugging information to the graphic
+    :returns: digest of the graphic, scaling factor, debug flag, text mode and batching
+    """
+    width, height = graphic.size().toRound()
+    scaling_factor = guess_scaling_factor(ISize(width, height))
+    return (graphic.digest, scaling_factor, debug, text_blobs_enabled(), batching_enabled())
+
+
+def _cached_image(key: RenderKey) -> Image | None:
+    """Looks up a rendered image in the render cache, and then in the on-disk cache
+    (when enabled).
+
+    :param key: key of the rendering
+    :returns: the cached image, or None if it is not cached
+    """
+    image = render_cache.get(key)
+    if image is None:
+        image = disk_cache.load(key)
+        if image is not None:
+            render_cache.put(key, image)
+    return image
+
+
+def render_cached(graphic: SkiaGraphic, debug: bool) -> Image:
+    """Renders a graphic into a Skia image, reusing the rendering of an equal graphic
+    from the render cache (or from the on-disk cache, when enabled) when available.
+
+    :param graphic: graphic to be rendered
+    :param debug: whether to add debugging information to the graphic
+    :returns: rendered graphic as a Skia image
+    """
+    key = _render_key(graphic, debug)
+    image = _cached_image(key)
+    if image is None:
+        image = graphic_to_image(add_debug_info(graphic) if debug else graphic)
+        disk_cache.store(key, image)
+        render_cache.put(key, image)
+    return image
+
+
+def _disable_nested_workers():
+    """Initializes a process that renders graphics, so that it renders each graphic
+    by itself instead of starting its own pool of processes.
+    """
+    os.environ.pop("PYTAMARO_RENDER_WORKERS", None)
+
+
+def _render_specs_pixels(specs: list[Spec]) -> tuple[int, int, bytes]:
+    """Renders the graphic described by a list of specs (in a process of a pool).
+
+    :param specs: specs of the graphic
+    :returns: the width and height of the image, and the (premultiplied) RGBA
+              values of its pixels
+    """
+    image = graphic_to_image(graphic_from_specs(specs))
+    pixels = image.convert(alphaType=kPremul_AlphaType, colorType=kRGBA_8888_ColorType)
+    return image.width(), image.height(), pixels.tobytes()
+
+
+def graphics_to_pillow_images(graphics: list[Graphic]) -> list[PILImage]:
+    """Renders several graphics and converts them into Pillow images.
 
+    When parallel rendering is enabled (see `render_workers()`), the graphics that
+    are not cached are rendered by a pool of processes. Each graphic is sent as its
+    list of exact specs (see :file:`impl/ffi/specs.py`), with shared graphics
+    referenced instead of repeated, which the processes evaluate without recursion
+    into the very same graphic.
 
-def _save_as_PNG(filename: str, graphic: SkiaGraphic):
+    :param graphics: graphics to be rendered and converted
+    :returns: rendered graphics as Pillow images
+    """
+    workers = render_workers()
+    if workers <= 1 or len(graphics) <= 1:
+        return [graphic_to_pillow_image(graphic) for graphic in graphics]
+    for graphic in graphics:
+        check_graphic_size(graphic_size(graphic).to_round())
+    skia_graphics = cast(list[SkiaGraphic], graphics)
+    keys = [_render_key(graphic, False) for graphic in skia_graphics]
+    images = [_cached_image(key) for key in keys]
+    missing = [index for index, image in enumerate(images) if image is None]
+    if len(missing) > 0:
+        all_specs = [to_specs(skia_graphics[index], dedup=True, exact=True) for index in missing]
+        with _process_pool(min(workers, len(missing)), _disable_nested_workers) as executor:
+            results = executor.map(_render_specs_pixels, all_specs)
+            for index, (width, height, pixels) in zip(missing, results, strict=True):
+                image = Image.frombytes(
+                    pixels, (width, height), kRGBA_8888_ColorType, kPremul_AlphaType
+                )
+                disk_cache.store(keys[index], image)
+                render_cache.put(keys[index], image)
+                images[index] = image
+    return [_to_pillow_image(image) for image in images]  # type: ignore
+
+
+def _save_as_PNG(filename: str, graphic: SkiaGraphic, debug: bool = False):
     """Save a graphic to a PNG file.
 
     :param filename: name of the file to be created, ending in ".png"
     :param graphic: graphic to be saved
+    :param debug: whether to add debugging information to the graphic
+    """
+    width, height = graphic.size().toRound()
+    if ISize(width, height).too_large_area():
+        _save_as_tiled_PNG(filename, add_debug_info(graphic) if debug else graphic)
+    else:
+        render_cached(graphic, debug).save(filename, kPNG)
+
+
+def _save_as_tiled_PNG(filename: str, graphic: SkiaGraphic, tile_size: int = TILE_SIZE):
+    """Save a graphic to a PNG file, rendering it tile by tile so that the whole
+    image is never kept in memory: each band of tiles is encoded as soon as it
+    is rendered.
+
+    :param filename: name of the file to be created, ending in ".png"
+    :param graphic: graphic to be saved
+    :param tile_size: side of the tiles, in pixels
     """
-    graphic_to_image(graphic).save(filename, kPNG)
+    width, height = graphic.size().toRound()
+    scaling_factor = guess_scaling_factor(ISize(width, height))
+    picture = _record_picture(graphic)
+    with open(filename, "wb") as file:
+        writer = PNGWriter(file, width, height)
+        for top in range(0, height, tile_size):
+            band_height = min(tile_size, height - top)
+            band = PILImageMod.new("RGBA", (width, band_height))
+            for left in range(0, width, tile_size):
+                tile = Rect.MakeXYWH(left, top, min(tile_size, width - left), band_height)
+                band.paste(_to_pillow_image(_render_tile(picture, tile, scaling_factor)), (left, 0))
+            writer.write_rows(band.tobytes())
+        writer.finish()
 
 
 def show_graphic(graphic: Graphic, debug: bool):
     graphic = cast(SkiaGraphic, graphic)
     rounded_size = graphic_size(graphic).to_round()
     check_graphic_size(rounded_size)
-    to_show = add_debug_info(graphic) if debug else graphic
-    pil_image = graphic_to_pillow_image(to_show)
+    pil_image = _to_pillow_image(render_cached(graphic, debug))
     if is_notebook():
         display(pil_image)  # type: ignore[name-defined]  # noqa: F821
     elif "PYTAMARO_OUTPUT_DATA_URI" in os.environ:
@@ -151,14 +437,14 @@ def show_graphic(graphic: Graphic, debug: bool):
 
 def save_graphic(filename: str, graphic: Graphic, debug: bool):
     graphic = cast(SkiaGraphic, graphic)
-    to_show = add_debug_info(graphic) if debug else graphic
     extension = Path(filename).suffix
     if extension == ".png":
         rounded_size = graphic_size(graphic).to_round()
-        check_graphic_size(rounded_size)
-        _save_as_PNG(filename, to_show)
+        # Graphics too large for a single surface are saved tile by tile.
+        check_graphic_size(rounded_size, allow_large=True)
+        _save_as_PNG(filename, graphic, debug)
     elif extension == ".svg":
-        _save_as_SVG(filename, to_show)
+        _save_as_SVG(filename, add_debug_info(graphic) if debug else graphic)
     else:
         raise ValueError(translate("INVALID_FILENAME_EXTENSION"))
 
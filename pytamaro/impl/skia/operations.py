@@ -7,6 +7,7 @@
 from typing import cast
 
 from pytamaro.graphic import Graphic
+from pytamaro.impl.interning import Interner
 from pytamaro.impl.skia.graphic import (
     SkiaAbove,
     SkiaBeside,
@@ -18,6 +19,9 @@ from pytamaro.impl.skia.graphic import (
 )
 from pytamaro.point import Point
 
+# Shares structurally equal compositions, when interning is enabled.
+_interner: Interner[SkiaGraphic] = Interner()
+
 
 def graphic_width(graphic: Graphic) -> int:
     graphic = cast(SkiaGraphic, graphic)
@@ -32,32 +36,32 @@ def graphic_height(graphic: Graphic) -> int:
 def compose(foreground_graphic: Graphic, background_graphic: Graphic) -> SkiaGraphic:
     foreground_graphic = cast(SkiaGraphic, foreground_graphic)
     background_graphic = cast(SkiaGraphic, background_graphic)
-    return SkiaCompose(foreground_graphic, background_graphic)
+    return _interner.intern(SkiaCompose, foreground_graphic, background_graphic)
 
 
 def pin(point: Point, graphic: Graphic) -> SkiaGraphic:
     graphic = cast(SkiaGraphic, graphic)
-    return SkiaPin(graphic, point)
+    return _interner.intern(SkiaPin, graphic, point)
 
 
 def overlay(foreground_graphic: Graphic, background_graphic: Graphic) -> SkiaGraphic:
     foreground_graphic = cast(SkiaGraphic, foreground_graphic)
     background_graphic = cast(SkiaGraphic, background_graphic)
-    return SkiaOverlay(foreground_graphic, background_graphic)
+    return _interner.intern(SkiaOverlay, foreground_graphic, background_graphic)
 
 
 def beside(left_graphic: Graphic, right_graphic: Graphic) -> SkiaGraphic:
     left_graphic = cast(SkiaGraphic, left_graphic)
     right_graphic = cast(SkiaGraphic, right_graphic)
-    return SkiaBeside(left_graphic, right_graphic)
+    return _interner.intern(SkiaBeside, left_graphic, right_graphic)
 
 
 def above(top_graphic: Graphic, bottom_graphic: Graphic) -> SkiaGraphic:
     top_graphic = cast(SkiaGraphic, top_graphic)
     bottom_graphic = cast(SkiaGraphic, bottom_graphic)
-    return SkiaAbove(top_graphic, bottom_graphic)
+    return _interner.intern(SkiaAbove, top_graphic, bottom_graphic)
 
 
 def rotate(angle: float, graphic: Graphic) -> SkiaGraphic:
     graphic = cast(SkiaGraphic, graphic)
-    return SkiaRotate(graphic, angle)
+    return _interner.intern(SkiaRotate, graphic, angle)
@@ -5,6 +5,7 @@
 
 # ruff: noqa: D103
 from pytamaro.color import Color
+from pytamaro.impl.interning import Interner
 from pytamaro.impl.skia.graphic import (
     SkiaCircularSector,
     SkiaEllipse,
@@ -15,26 +16,29 @@ from pytamaro.impl.skia.graphic import (
     SkiaTriangle,
 )
 
+# Shares structurally equal primitives, when interning is enabled.
+_interner: Interner[SkiaGraphic] = Interner()
+
 
 def rectangle(width: float, height: float, color: Color) -> SkiaGraphic:
-    return SkiaRectangle(width, height, color)
+    return _interner.intern(SkiaRectangle, width, height, color)
 
 
 def empty_graphic() -> SkiaGraphic:
-    return SkiaEmpty()
+    return _interner.intern(SkiaEmpty)
 
 
 def ellipse(width: float, height: float, color: Color) -> SkiaGraphic:
-    return SkiaEllipse(width, height, color)
+    return _interner.intern(SkiaEllipse, width, height, color)
 
 
 def circular_sector(radius: float, angle: float, color: Color) -> SkiaGraphic:
-    return SkiaCircularSector(radius, angle, color)
+    return _interner.intern(SkiaCircularSector, radius, angle, color)
 
 
 def triangle(side1: float, side2: float, angle: float, color: Color) -> SkiaGraphic:
-    return SkiaTriangle(side1, side2, angle, color)
+    return _interner.intern(SkiaTriangle, side1, side2, angle, color)
 
 
 def text(content: str, font: str, points: float, color: Color) -> SkiaGraphic:
-    return SkiaText(content, font, points, color)
+    return _interner.intern(SkiaText, content, font, points, color)
@@ -0,0 +1,119 @@
+"""In-process cache of rendered graphics, so that rendering the same graphic
+again (e.g., showing it and then saving it) is a lookup.
+
+The cache is a least-recently-used cache, bounded by the total size (in bytes)
+of the rendered images. Its capacity can be configured with the environment
+variable `PYTAMARO_RENDER_CACHE_BYTES` (0 disables the cache).
+
+:meta private:
+"""
+
+import os
+from collections import OrderedDict
+from typing import NamedTuple
+
+from skia import Image
+
+# Default capacity of the cache, in bytes.
+DEFAULT_CAPACITY = 64 * 1024 * 1024
+
+RenderKey = tuple[bytes, int, bool, bool, bool]
+
+
+class RenderCacheInfo(NamedTuple):
+    """Statistics about a render cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    images: int
+    size: int
+    capacity: int
+
+
+def render_cache_capacity() -> int:
+    """Returns the capacity of the render cache, in bytes.
+
+    :returns: the value of the environment variable `PYTAMARO_RENDER_CACHE_BYTES`,
+              or a default capacity when it is not set
+    """
+    return int(os.environ.get("PYTAMARO_RENDER_CACHE_BYTES", DEFAULT_CAPACITY))
+
+
+def _image_size(image: Image) -> int:
+    """Computes the size of the pixels of an image, in bytes."""
+    return image.height() * image.imageInfo().minRowBytes()
+
+
+class RenderCache:
+    """A cache of rendered images, evicting the least recently used ones when their
+    total size exceeds the capacity.
+
+    Images are identified by the structural digest of the rendered graphic, the
+    scaling factor used for super-sampling, whether debugging information was
+    added, and whether texts were drawn as text blobs. Skia images are immutable,
+    so they can be shared by the callers.
+    """
+
+    def __init__(self):  # noqa: D107
+        self._images: OrderedDict[RenderKey, Image] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: RenderKey) -> Image | None:
+        """Looks up a rendered image.
+
+        :param key: digest of the graphic, scaling factor, debug flag, text mode and batching
+        :returns: the cached image, or None if it is not cached
+        """
+        image = self._images.get(key)
+        if image is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._images.move_to_end(key)
+        return image
+
+    def put(self, key: RenderKey, image: Image):
+        """Adds a rendered image to the cache, evicting the least recently used
+        images if needed.
+        Images larger than the capacity are not cached.
+
+        :param key: digest of the graphic, scaling factor, debug flag, text mode and batching
+        :param image: rendered image
+        """
+        capacity = render_cache_capacity()
+        size = _image_size(image)
+        if size > capacity or key in self._images:
+            return
+        self._images[key] = image
+        self._size += size
+        while self._size > capacity:
+            _, evicted = self._images.popitem(last=False)
+            self._size -= _image_size(evicted)
+            self._evictions += 1
+
+    def clear(self):
+        """Removes all the images from the cache (statistics are kept)."""
+        self._images.clear()
+        self._size = 0
+
+    def info(self) -> RenderCacheInfo:
+        """Returns statistics about the cache.
+
+        :returns: hits, misses, evictions, number and total size of the cached
+                  images, and capacity
+        """
+        return RenderCacheInfo(
+            self._hits,
+            self._misses,
+            self._evictions,
+            len(self._images),
+            self._size,
+            render_cache_capacity(),
+        )
+
+
+render_cache = RenderCache()
@@ -0,0 +1,90 @@
+"""Specs sequence to Skia graphic.
+
+Evaluates the sequence of specs produced by :file:`impl/ffi/specs.py` (the same
+format used to send graphics to JavaScript), rebuilding the graphic without
+recursion: the specs are in postfix order, so each spec takes the graphics it
+depends on from a stack and pushes the graphic it describes.
+
+:meta private:
+"""
+
+from struct import pack, unpack
+
+from pytamaro.color import Color
+from pytamaro.impl.skia import operations, primitives
+from pytamaro.impl.skia.graphic import SkiaGraphic
+from pytamaro.point import Point
+from pytamaro.utils import Spec
+
+
+def _color(spec: Spec) -> Color:
+    """Decodes the color of a spec from its ARGB 32-bit word, using the exact alpha
+    of exact specs (see `to_specs()`).
+    """
+    value = spec["color"]
+    alpha = spec.get("alpha", (value >> 24) / 255)
+    return Color((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF, alpha)
+
+
+def _point(value: int) -> Point:
+    """Decodes a point from its 64-bit representation (two 32-bit floats)."""
+    x = unpack(">f", pack(">I", value >> 32))[0]
+    y = unpack(">f", pack(">I", value & 0xFFFFFFFF))[0]
+    return Point(x, y)
+
+
+def _primitive(spec: Spec) -> SkiaGraphic:
+    """Creates the primitive graphic described by a spec without dependencies."""
+    kind = spec["t"]
+    if kind == "Empty":
+        return primitives.empty_graphic()
+    color = _color(spec)
+    if kind == "Rectangle":
+        return primitives.rectangle(spec["width"], spec["height"], color)
+    if kind == "Ellipse":
+        return primitives.ellipse(spec["width"], spec["height"], color)
+    if kind == "CircularSector":
+        return primitives.circular_sector(spec["radius"], spec["angle"], color)
+    if kind == "Triangle":
+        return primitives.triangle(spec["side1"], spec["side2"], spec["angle"], color)
+    if kind == "Text":
+        return primitives.text(spec["text"], spec["font_name"], spec["text_size"], color)
+    raise ValueError(f"Unknown spec type: {kind}")
+
+
+def graphic_from_specs(specs: list[Spec]) -> SkiaGraphic:
+    """Turn a list of specs into a graphic, evaluating them (without recursion)
+    with a stack.
+
+    :param specs: specs, in postfix order (possibly with references to the graphic
+                  evaluated for a previous spec)
+    :returns: the graphic described by the specs
+    """
+    # Graphic evaluated for each spec, to resolve references.
+    graphics: list[SkiaGraphic] = []
+    stack: list[SkiaGraphic] = []
+    for spec in specs:
+        kind = spec["t"]
+        if kind == "Ref":
+            graphic = graphics[spec["index"]]
+        elif kind == "Compose":
+            # The first dependency (the foreground) is on top of the stack.
+            foreground, background = stack.pop(), stack.pop()
+            if "fg_pin" in spec:
+                foreground = operations.pin(_point(spec["fg_pin"]), foreground)
+            if "bg_pin" in spec:
+                background = operations.pin(_point(spec["bg_pin"]), background)
+            graphic = operations.compose(foreground, background)
+            if "pin" in spec:
+                graphic = operations.pin(_point(spec["pin"]), graphic)
+        elif kind == "Pin":
+            graphic = operations.pin(_point(spec["pin"]), stack.pop())
+        elif kind == "Rotate":
+            graphic = operations.rotate(spec["angle"], stack.pop())
+        else:
+            graphic = _primitive(spec)
+        graphics.append(graphic)
+        stack.append(graphic)
+    if len(stack) != 1:
+        raise ValueError("The specs do not describe a single graphic")
+    return stack[0]
@@ -67,7 +67,7 @@ def _save_animation(filename: str, graphics: list[Graphic], duration: int, loop:
         raise ValueError(translate("EMPTY_GRAPHICS_LIST"))
     for idx, graphic in enumerate(graphics):
         check_type(graphic, Graphic, "graphics", idx)
-    pil_images = list(map(__impl.graphic_to_pillow_image, graphics))
+    pil_images = __impl.graphics_to_pillow_images(graphics)
     if len(set(image.size for image in pil_images)) != 1:
         raise ValueError(translate("DIFFERENT_SIZES"))
     check_type(duration, int, "duration")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from struct import pack, unpack
 
 from pytamaro.localization import translate
@@ -38,7 +39,7 @@ class Point:
             return translate(maybe_known_point)
         return f"Point({self.x}, {self.y})"
 
-    @property
+    @cached_property
     def value_for_spec(self) -> int:
         """64-bit representation of this Point, to be used in a spec.
         Floats are converted to 32-bit floats, and then into 32-bit integers,
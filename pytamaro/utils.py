@@ -78,6 +78,14 @@ class ISize:
         surface_size = self.width * self.height * bytes_per_pixel
         return surface_size > sk_maxs32
 
+    def too_large_tiled_area(self) -> bool:
+        """Check if the size is too large to be saved tile by tile into a PNG file,
+        whose image data is limited to 4GB, assuming 4 bytes per pixel.
+        This also keeps each dimension within the limit of the PNG format (2^31 - 1).
+        """
+        max_pixels = 2**30
+        return self.width * self.height > max_pixels
+
 
 @dataclass
 class Size:
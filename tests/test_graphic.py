@@ -1,8 +1,10 @@
+from pytest import approx
+
 from pytamaro.color_names import blue, green, red
 from pytamaro.impl.ffi.specs import to_specs
-from pytamaro.operations import beside, compose, pin, rotate
+from pytamaro.operations import above, beside, compose, overlay, pin, rotate
 from pytamaro.point_names import center_left, center_right, top_left
-from pytamaro.primitives import ellipse, empty_graphic, rectangle, triangle
+from pytamaro.primitives import circular_sector, ellipse, empty_graphic, rectangle, triangle
 from tests.testing_utils import HEIGHT, WIDTH
 
 # ruff: noqa: PLR2004, PLC0415
@@ -121,11 +123,249 @@ def test_hash_empty_graphic_ffi():
     _enable_skia_impl()
 
 
+def test_interning(monkeypatch):
+    import gc
+
+    from pytamaro.color_functions import rgb_color
+    from pytamaro.impl.skia.primitives import _interner
+
+    monkeypatch.setenv("PYTAMARO_INTERN", "True")
+    r1 = rectangle(WIDTH, HEIGHT, rgb_color(1, 2, 3))
+    r2 = rectangle(WIDTH, HEIGHT, rgb_color(1, 2, 3))
+    assert r1 is r2
+    assert beside(r1, r2) is beside(r1, r2)
+    assert empty_graphic() is empty_graphic()
+    assert rectangle(float(WIDTH), HEIGHT, red) is not rectangle(WIDTH, HEIGHT, red)
+    interned = len(_interner)
+    del r1, r2
+    gc.collect()
+    assert len(_interner) < interned
+    monkeypatch.delenv("PYTAMARO_INTERN")
+    assert rectangle(WIDTH, HEIGHT, red) is not rectangle(WIDTH, HEIGHT, red)
+
+
+def test_compact_layout():
+    from dataclasses import FrozenInstanceError
+
+    import pytest
+
+    from pytamaro.graphic import Beside, Graphic, Rectangle
+
+    r = rectangle(WIDTH, HEIGHT, red)
+    g = beside(r, r)
+    assert not hasattr(r, "__dict__")
+    assert not hasattr(g, "__dict__")
+    assert isinstance(r, Graphic) and isinstance(r, Rectangle)
+    assert isinstance(g, Graphic) and isinstance(g, Beside)
+    assert repr(r) == f"rectangle({WIDTH}, {HEIGHT}, red)"
+    with pytest.raises(FrozenInstanceError):
+        r.width = 0  # pyright: ignore[reportAttributeAccessIssue]
+
+
+def test_copy():
+    import copy
+
+    g = beside(rectangle(WIDTH, HEIGHT, red), rotate(30, ellipse(WIDTH, HEIGHT, blue)))
+    copied = copy.copy(g)
+    assert copied is not g
+    assert copied == g
+    assert copied.size() == g.size()  # pyright: ignore[reportAttributeAccessIssue]
+
+
+def test_display_list():
+    from pytamaro.impl.skia.io import graphic_to_image
+
+    g = beside(
+        rectangle(WIDTH, HEIGHT, red),
+        beside(empty_graphic(), rotate(45, ellipse(WIDTH, HEIGHT, blue))),
+    )
+    display_list = g.display_list  # pyright: ignore[reportAttributeAccessIssue]
+    assert len(display_list) == 2
+    # The right graphic is the background, drawn first
+    assert display_list.colors[1] == int(rectangle(WIDTH, HEIGHT, red).skia_color)  # pyright: ignore[reportAttributeAccessIssue]
+    first = graphic_to_image(g).tobytes()  # pyright: ignore[reportArgumentType]
+    # The display list is compiled once, and replayed for each rendering
+    assert graphic_to_image(g).tobytes() == first  # pyright: ignore[reportArgumentType]
+    assert g.display_list is display_list  # pyright: ignore[reportAttributeAccessIssue]
+
+
+def test_paint_cache():
+    from pytamaro.impl.skia.display_list import paint_cache_info
+    from pytamaro.impl.skia.io import graphic_to_image
+
+    e = ellipse(WIDTH, HEIGHT, green)
+    before = paint_cache_info()
+    # Overlapping ellipses, which are drawn separately
+    graphic_to_image(compose(e, compose(e, e)))  # pyright: ignore[reportArgumentType]
+    after = paint_cache_info()
+    # At most one paint is created, and then shared by the other ellipses
+    assert after.misses - before.misses <= 1
+    assert after.hits - before.hits >= 2
+
+
+def test_batched_display_list():
+    from functools import reduce
+
+    from skia import Surface
+
+    from pytamaro.color_functions import rgb_color
+
+    def render(display_list) -> bytes:
+        surface = Surface(10 * WIDTH, HEIGHT)
+        display_list.replay(surface.getCanvas())
+        return surface.makeImageSnapshot().tobytes()
+
+    translucent_red = rgb_color(255, 0, 0, 0.5)
+    r = rectangle(WIDTH, HEIGHT, translucent_red)
+    row = r
+    for _ in range(9):
+        row = beside(row, r)
+    display_list = row.display_list  # pyright: ignore[reportAttributeAccessIssue]
+    assert len(display_list.batched()) == 1
+    assert render(display_list.batched()) == render(display_list)
+    # Overlapping translucent rectangles must be blended one after the other
+    overlapping = compose(r, r).display_list  # pyright: ignore[reportAttributeAccessIssue]
+    assert len(overlapping.batched()) == 2
+    # Batching can move the edges of rotated boards with fractional sizes, so by
+    # default graphics are drawn unbatched
+    colors = [translucent_red, blue]
+    for angle, side in ((90, 7.3), (180, 13.7), (270, 13.7)):
+        rows = [reduce(beside, [rectangle(side, side, color)] * 6) for color in colors * 3]
+        board = rotate(angle, reduce(above, rows))
+        display_list = board.display_list  # pyright: ignore[reportAttributeAccessIssue]
+        assert len(display_list.batched()) < len(display_list)
+        images = []
+        for draw in (board.draw, display_list.replay):  # pyright: ignore[reportAttributeAccessIssue]
+            surface = Surface(300, 300)
+            surface.getCanvas().scale(3, 3)
+            bounds = board.bounds  # pyright: ignore[reportAttributeAccessIssue]
+            surface.getCanvas().translate(-bounds.left(), -bounds.top())
+            draw(surface.getCanvas())
+            images.append(surface.makeImageSnapshot().tobytes())
+        assert images[0] == images[1]
+
+
+def test_occlusion_culling(monkeypatch):
+    from pytamaro.color_functions import rgb_color
+    from pytamaro.impl.skia.io import graphic_to_image
+
+    hidden = beside(ellipse(WIDTH, HEIGHT, blue), rotate(90, rectangle(WIDTH, WIDTH, red)))
+    cover = rectangle(3 * WIDTH, 2 * HEIGHT, green)
+    g = beside(compose(cover, hidden), rectangle(WIDTH, HEIGHT, red))
+    assert len(g.display_list.culled()) == 2  # pyright: ignore[reportAttributeAccessIssue]
+    # A translucent rectangle does not hide anything
+    translucent_cover = rectangle(3 * WIDTH, 2 * HEIGHT, rgb_color(0, 255, 0, 0.5))
+    g2 = compose(translucent_cover, hidden)
+    assert len(g2.display_list.culled()) == 3  # pyright: ignore[reportAttributeAccessIssue]
+    # Same pixels with and without culling
+    monkeypatch.setenv("PYTAMARO_OCCLUSION_CULLING", "True")
+    with_culling = graphic_to_image(g).tobytes()  # pyright: ignore[reportArgumentType]
+    monkeypatch.delenv("PYTAMARO_OCCLUSION_CULLING")
+    assert graphic_to_image(g).tobytes() == with_culling  # pyright: ignore[reportArgumentType]
+
+
+def test_shared_subtree_picture():
+    from pytamaro.impl.skia.io import graphic_to_image
+    from pytamaro.operations import overlay
+
+    def cell():
+        return overlay(rotate(30, ellipse(WIDTH, HEIGHT, blue)), rectangle(HEIGHT, HEIGHT, red))
+
+    shared_cell = cell()
+    shared = beside(shared_cell, beside(shared_cell, shared_cell))
+    display_list = shared.display_list  # pyright: ignore[reportAttributeAccessIssue]
+    assert len(display_list) == 3
+    assert all(recorded is shared_cell for recorded in display_list.recorded)  # pyright: ignore[reportAttributeAccessIssue]
+    not_shared = beside(cell(), beside(cell(), cell()))
+    assert len(not_shared.display_list) == 6  # pyright: ignore[reportAttributeAccessIssue]
+    assert graphic_to_image(shared).tobytes() == graphic_to_image(not_shared).tobytes()  # pyright: ignore[reportArgumentType]
+
+
+def test_shape_fast_paths():
+    from skia import Surface
+
+    from pytamaro.impl.skia.display_list import DisplayList
+
+    graphics = [
+        rectangle(WIDTH, HEIGHT, red),
+        ellipse(WIDTH, HEIGHT, red),
+        *(circular_sector(HEIGHT, angle, red) for angle in (45, 200, 360)),
+    ]
+    for graphic in graphics:
+        for angle in (0, 90, 30):
+            display_list = rotate(angle, graphic).display_list  # pyright: ignore[reportAttributeAccessIssue]
+            assert display_list.shapes[0] is not None
+            # The same command, without the shape
+            path_only = DisplayList()
+            path_only.add_path(
+                display_list.matrices[0],
+                display_list.paths[0],
+                display_list.colors[0],
+                display_list.antialias[0],
+            )
+            images = []
+            for commands in (display_list, path_only):
+                surface = Surface(2 * WIDTH, 2 * WIDTH)
+                surface.getCanvas().translate(WIDTH, WIDTH)
+                commands.replay(surface.getCanvas())
+                images.append(surface.makeImageSnapshot().tobytes())
+            assert images[0] == images[1]
+
+
 def test_empty_area_not_empty_graphic():
     g = rectangle(0, HEIGHT, red)
     assert g.zero_pixels()  # pyright: ignore[reportAttributeAccessIssue]
 
 
+def test_primitive_bounds_match_path():
+    graphics = [
+        rectangle(WIDTH, HEIGHT, red),
+        ellipse(WIDTH, HEIGHT, red),
+        triangle(WIDTH, HEIGHT, 120, red),
+        *(circular_sector(HEIGHT, angle, red) for angle in (0, 45, 90, 135, 200, 300, 360)),
+    ]
+    for graphic in graphics:
+        bounds = graphic.bounds  # pyright: ignore[reportAttributeAccessIssue]
+        path_bounds = graphic.path.computeTightBounds()  # pyright: ignore[reportAttributeAccessIssue]
+        assert tuple(bounds) == approx(tuple(path_bounds), abs=1e-4)
+
+
+def test_rotated_bounds_match_path():
+    from pytamaro.impl.geometry import TOLERANCE
+    from pytamaro.primitives import text
+
+    graphics = [
+        beside(ellipse(WIDTH, HEIGHT, red), triangle(WIDTH, HEIGHT, 120, blue)),
+        circular_sector(30, 250, red),
+        beside(text("Hello", "", 20, red), rotate(45, text("gjQ", "", 200, blue))),
+    ]
+    for graphic in graphics:
+        for angle in (0, 17, 30, 45, 90, 137, 180, 300):
+            rotated = rotate(angle, graphic)
+            left, top, right, bottom = rotated.bounds  # pyright: ignore[reportAttributeAccessIssue]
+            path_bounds = rotated.path.computeTightBounds()  # pyright: ignore[reportAttributeAccessIssue]
+            # The bounds always contain the outline (whose points are 32-bit floats),
+            # exceeding it by at most the tolerance
+            margins = (
+                path_bounds.left() - left,
+                path_bounds.top() - top,
+                right - path_bounds.right(),
+                bottom - path_bounds.bottom(),
+            )
+            assert all(-1e-4 <= margin <= TOLERANCE for margin in margins)
+
+
+def test_hull_shared():
+    from functools import reduce
+
+    # Equal primitives share their hull, and compositions keep the merged one
+    assert ellipse(WIDTH, HEIGHT, red).hull is ellipse(WIDTH, HEIGHT, blue).hull  # pyright: ignore[reportAttributeAccessIssue]
+    row = reduce(beside, [ellipse(WIDTH, HEIGHT, red)] * 10)
+    assert hasattr(row.composed_graphic.graphic, "_hull")  # pyright: ignore[reportAttributeAccessIssue]
+    same_row = reduce(beside, [ellipse(WIDTH, HEIGHT, red)] * 10)
+    assert rotate(30, row).size() == rotate(30, same_row).size()  # pyright: ignore[reportAttributeAccessIssue]
+
+
 def _enable_ffi_impl():
     import sys
     from unittest.mock import MagicMock
@@ -260,3 +500,163 @@ def test_to_specs_nested_compose():
     types = [s["t"] for s in specs]
     assert types == ["Triangle", "Ellipse", "Compose", "Empty", "Rectangle", "Compose", "Compose"]
     _enable_skia_impl()
+
+
+def test_to_specs_dedup():
+    _enable_ffi_impl()
+    g = compose(rectangle(WIDTH, HEIGHT, red), triangle(WIDTH, HEIGHT, 60, blue))
+    # Without shared graphics, the same specs are emitted
+    assert to_specs(g, dedup=True) == to_specs(g)
+    for _ in range(20):
+        g = beside(g, g)
+    specs = to_specs(g, dedup=True)
+    # Each distinct graphic is emitted once (instead of 2**20 times), and then referenced
+    assert len(specs) == 3 + 2 * 20
+    refs = [spec for spec in specs if spec["t"] == "Ref"]
+    assert len(refs) == 20
+    assert all(specs[ref["index"]]["t"] == "Compose" for ref in refs)
+    _enable_skia_impl()
+
+
+def test_memoized_specs():
+    _enable_ffi_impl()
+    c = compose(rectangle(WIDTH, HEIGHT, red), ellipse(WIDTH, HEIGHT, blue))
+    spec, deps = c.spec_with_deps()
+    # The spec is computed once, and then reused
+    assert c.spec_with_deps()[0] is spec
+    # So are the packed words of colors and points
+    c.foreground.spec_with_deps()  # pyright: ignore[reportAttributeAccessIssue]
+    assert "value_for_spec" in red.__dict__
+    # Pinning the composition does not modify the (shared) spec of the composition
+    pinned_spec, pinned_deps = pin(top_left, c).spec_with_deps()
+    assert "pin" in pinned_spec
+    assert "pin" not in spec
+    assert pinned_deps == deps
+    assert to_specs(beside(c, c))[2] is spec
+    _enable_skia_impl()
+
+
+def test_encode_specs():
+    from pytamaro.color_functions import rgb_color
+    from pytamaro.impl.ffi.encoding import decode_specs, encode_specs
+    from pytamaro.primitives import text
+
+    _enable_ffi_impl()
+    r = rectangle(WIDTH, HEIGHT, red)
+    g = compose(
+        pin(center_left, beside(r, text("héllo", "Serif", 12, blue))),
+        rotate(30, pin(top_left, circular_sector(HEIGHT, 90, green))),
+    )
+    specs = to_specs(above(g, overlay(triangle(WIDTH, HEIGHT, 60, red), empty_graphic())))
+    words = encode_specs(specs)
+    assert words.itemsize == 4
+    assert decode_specs(words) == specs
+    shared = to_specs(beside(g, g), dedup=True)
+    assert decode_specs(encode_specs(shared)) == shared
+    # Exact specs, with the alpha of colors and rotations by multiples of 360 degrees
+    translucent = rgb_color(10, 20, 30, 0.25)
+    exact = to_specs(rotate(360, beside(g, rectangle(WIDTH, HEIGHT, translucent))), exact=True)
+    assert any(spec.get("alpha") == 0.25 for spec in exact)
+    assert decode_specs(encode_specs(exact)) == exact
+    _enable_skia_impl()
+
+
+def _sample_graphic(primitives, operations):
+    r = primitives.rectangle(WIDTH, HEIGHT, red)
+    t = primitives.triangle(WIDTH, HEIGHT, 130, blue)
+    g = operations.beside(r, operations.rotate(37, t))
+    g = operations.above(
+        g, operations.pin(top_left, primitives.circular_sector(HEIGHT, 200, green))
+    )
+    g = operations.compose(operations.pin(center_right, g), primitives.ellipse(WIDTH, 3, red))
+    g = operations.overlay(operations.rotate(-100, g), primitives.empty_graphic())
+    return operations.beside(g, operations.rotate(45, operations.compose(g, g)))
+
+
+def test_ffi_local_size():
+    from typing import cast
+    from unittest.mock import MagicMock
+
+    import pytamaro.impl.skia.operations as skia_operations
+    import pytamaro.impl.skia.primitives as skia_primitives
+
+    _enable_ffi_impl()
+    import pytamaro.impl.ffi.operations as ffi_operations
+    import pytamaro.impl.ffi.primitives as ffi_primitives
+    from pytamaro.impl.ffi.bounds import graphic_size
+
+    js_graphic_size = cast(MagicMock, ffi_operations.js_graphic_size)  # pyright: ignore[reportAttributeAccessIssue]
+    js_graphic_size.reset_mock()
+    g = _sample_graphic(ffi_primitives, ffi_operations)
+    skia_size = _sample_graphic(skia_primitives, skia_operations).size()
+    size = graphic_size(g)
+    assert size is not None
+    assert (size.width, size.height) == approx((skia_size.width(), skia_size.height()), abs=0.02)
+    assert ffi_operations.graphic_width(g) == round(size.width)
+    assert ffi_operations.graphic_height(g) == round(size.height)
+    # The sizes are computed without calling JavaScript, and kept on the graphics
+    assert not js_graphic_size.called
+    assert g.__dict__["_layout"].bounds[2] - g.__dict__["_layout"].bounds[0] == size.width
+    # Texts are measured by JavaScript
+    assert graphic_size(ffi_operations.beside(g, ffi_primitives.text("a", "", 12, red))) is None
+    _enable_skia_impl()
+
+
+def test_local_js_ffi():
+    import importlib
+
+    import pytamaro.impl.ffi.io as ffi_io
+    import pytamaro.impl.ffi.operations as ffi_operations
+    import pytamaro.impl.ffi.primitives as ffi_primitives
+    import pytamaro.impl.skia.io as skia_io
+    import pytamaro.impl.skia.operations as skia_operations
+    import pytamaro.impl.skia.primitives as skia_primitives
+    from pytamaro.impl.ffi import local_js_ffi
+    from pytamaro.impl.skia.render_cache import render_cache
+
+    local_js_ffi.install()
+    importlib.reload(ffi_operations)
+    importlib.reload(ffi_io)
+    labels = [ffi_primitives.text("10", "", 12, red), skia_primitives.text("10", "", 12, red)]
+    g = ffi_operations.beside(_sample_graphic(ffi_primitives, ffi_operations), labels[0])
+    expected = skia_operations.beside(_sample_graphic(skia_primitives, skia_operations), labels[1])
+    # Texts are measured by the local implementation
+    assert ffi_operations.graphic_width(g) == skia_operations.graphic_width(expected)
+    image = ffi_io.graphic_to_pillow_image(g)
+    assert image.tobytes() == skia_io.graphic_to_pillow_image(expected).tobytes()
+    # Rendering the same specs again reuses the rendered image
+    hits = render_cache.info().hits
+    assert ffi_io.graphic_to_pillow_image(g).tobytes() == image.tobytes()
+    assert render_cache.info().hits == hits + 1
+    _enable_ffi_impl()
+    importlib.reload(ffi_operations)
+    importlib.reload(ffi_io)
+    _enable_skia_impl()
+
+
+def test_graphic_from_specs():
+    import pytamaro.impl.skia.operations as skia_operations
+    import pytamaro.impl.skia.primitives as skia_primitives
+    from pytamaro.color_functions import rgb_color
+    from pytamaro.impl.skia.io import graphic_to_pillow_image
+    from pytamaro.impl.skia.specs import graphic_from_specs
+    from pytamaro.primitives import text
+
+    g = _sample_graphic(skia_primitives, skia_operations)
+    g = beside(g, pin(top_left, compose(g, triangle(WIDTH, HEIGHT, 60, red))))
+    expected = graphic_to_pillow_image(g).tobytes()
+    for dedup in (False, True):
+        rebuilt = graphic_from_specs(to_specs(g, dedup=dedup))
+        assert rebuilt.size() == g.size()  # pyright: ignore[reportAttributeAccessIssue]
+        assert graphic_to_pillow_image(rebuilt).tobytes() == expected
+    # Exact specs keep the alpha of colors and rotations by multiples of 360 degrees
+    translucent = rgb_color(200, 10, 30, 0.3)
+    g = beside(rotate(360, text("a", "", 12, blue)), rectangle(WIDTH, HEIGHT, translucent))
+    rebuilt = graphic_from_specs(to_specs(g, dedup=True, exact=True))
+    assert rebuilt.size() == g.size()  # pyright: ignore[reportAttributeAccessIssue]
+    assert graphic_to_pillow_image(rebuilt).tobytes() == graphic_to_pillow_image(g).tobytes()
+    # Deeply nested graphics are evaluated without recursion
+    deep = rectangle(WIDTH, HEIGHT, red)
+    for _ in range(10_000):
+        deep = rotate(1, deep)
+    assert graphic_from_specs(to_specs(deep)).size() == deep.size()  # pyright: ignore[reportAttributeAccessIssue]
@@ -104,6 +104,21 @@ def test_save_graphic_SVG():
         assert_SVG_file_width_height(filename, WIDTH, HEIGHT)
 
 
+def test_save_shapes_SVG():
+    from pathlib import Path  # noqa: PLC0415
+
+    from pytamaro.primitives import ellipse  # noqa: PLC0415
+
+    with NamedTemporaryFile() as f:
+        filename = f"{f.name}.svg"
+        save_graphic(filename, beside(rectangle(WIDTH, HEIGHT, red), ellipse(WIDTH, HEIGHT, blue)))
+        svg = Path(filename).read_text()
+        # Shapes are saved as compact elements, instead of paths
+        assert "<rect" in svg
+        assert "<ellipse" in svg
+        assert "<path" not in svg
+
+
 def test_save_graphic_wrong_no_ext():
     r = rectangle(WIDTH, HEIGHT, red)
     with NamedTemporaryFile() as f:
@@ -208,6 +223,17 @@ def test_show_deeply_nested_graphic():
     show_graphic(graphic)
 
 
+def test_show_very_deeply_nested_graphic():
+    element = rectangle(1, 1, red)
+    from functools import reduce  # noqa: PLC0415
+
+    recursion_limit = sys.getrecursionlimit()
+    graphic = reduce(beside, [element] * 10_000, empty_graphic())
+    # Implicitly assert that it does not throw
+    show_graphic(graphic)
+    assert sys.getrecursionlimit() == recursion_limit
+
+
 def test_animation_frames_not_overlaid():
     r1 = rectangle(WIDTH, HEIGHT, red)
     r2 = rectangle(HEIGHT, WIDTH, blue)
@@ -245,9 +271,279 @@ def test_image_large_size():
 
 
 def test_image_too_large_size():
+    # Too large to be shown (but it could be saved, tile by tile)
+    width = 30_000
+    height = 30_000
+    with raises(ValueError, match=f"{width}x{height}"):
+        show_graphic(rectangle(width, height, red))
+
+
+def test_image_too_large_size_tiled():
+    # Too large to be saved, even tile by tile
+    width = 200_000
+    height = 200_000
+    with NamedTemporaryFile() as f, raises(ValueError, match=f"{width}x{height}"):
+        save_graphic(f"{f.name}.png", rectangle(width, height, red))
+
+
+def test_save_tiled_PNG():
+    from PIL import ImageChops, ImageFilter  # noqa: PLC0415
+
+    from pytamaro.impl.skia.io import _save_as_PNG, _save_as_tiled_PNG  # noqa: PLC0415
+
+    g = beside(rotate(30, rectangle(5 * WIDTH, 3 * HEIGHT, blue)), rectangle(WIDTH, HEIGHT, red))
+    with NamedTemporaryFile() as f1, NamedTemporaryFile() as f2:
+        _save_as_PNG(f"{f1.name}.png", g)  # pyright: ignore[reportArgumentType]
+        _save_as_tiled_PNG(f"{f2.name}.png", g, tile_size=32)  # pyright: ignore[reportArgumentType]
+        image = ImageMod.open(f"{f1.name}.png")
+        tiled_image = ImageMod.open(f"{f2.name}.png")
+        assert tiled_image.size == image.size
+        assert tiled_image.mode == "RGBA"
+        # Some pixels on the outline might differ, due to rounding
+        diff = ImageChops.difference(image, tiled_image).filter(ImageFilter.MinFilter())
+        assert all(maximum <= 2 for _, maximum in diff.getextrema())  # pyright: ignore[reportGeneralTypeIssues]  # noqa: PLR2004
+
+
+def test_render_in_parallel(monkeypatch):
+    from PIL import ImageChops, ImageFilter  # noqa: PLC0415
+
+    from pytamaro.impl.skia import io  # noqa: PLC0415
+    from pytamaro.impl.skia.io import (  # noqa: PLC0415
+        _render_in_parallel,
+        _to_pillow_image,
+        graphic_to_image,
+        render_workers,
+    )
+
+    monkeypatch.setenv("PYTAMARO_RENDER_WORKERS", "2")
+    assert render_workers() == 2  # noqa: PLR2004
+    # Thin graphics, however long, are rendered without starting a pool of processes
+    monkeypatch.setattr(io, "_render_in_parallel", None)
+    assert graphic_to_image(rectangle(2000, 10, red)).width() == 2000  # pyright: ignore[reportArgumentType]  # noqa: PLR2004
+    monkeypatch.undo()
+    monkeypatch.delenv("PYTAMARO_RENDER_WORKERS", raising=False)
+    assert render_workers() == 0
+    g = beside(rotate(30, rectangle(5 * WIDTH, 3 * HEIGHT, blue)), rectangle(WIDTH, HEIGHT, red))
+    image = _to_pillow_image(graphic_to_image(g))  # pyright: ignore[reportArgumentType]
+    tiled_image = _to_pillow_image(_render_in_parallel(g, 2, tile_size=32))  # pyright: ignore[reportArgumentType]
+    assert tiled_image.size == image.size
+    # Some pixels on the outline might differ, due to rounding
+    diff = ImageChops.difference(image, tiled_image).filter(ImageFilter.MinFilter())
+    assert all(maximum <= 2 for _, maximum in diff.getextrema())  # pyright: ignore[reportGeneralTypeIssues]  # noqa: PLR2004
+
+
+def test_render_graphics_in_parallel(monkeypatch):
+    from pytamaro.color_functions import rgb_color  # noqa: PLC0415
+    from pytamaro.impl.skia.io import graphics_to_pillow_images  # noqa: PLC0415
+    from pytamaro.impl.skia.render_cache import render_cache  # noqa: PLC0415
+    from pytamaro.primitives import text  # noqa: PLC0415
+
+    translucent = rgb_color(200, 10, 30, 0.3)
+    frames = [
+        rotate(angle, beside(rectangle(WIDTH, HEIGHT, translucent), text("a", "", 12, blue)))
+        for angle in (0, 10, 20, 30)
+    ]
+    render_cache.clear()
+    images = graphics_to_pillow_images(frames)
+    render_cache.clear()
+    monkeypatch.setenv("PYTAMARO_RENDER_WORKERS", "2")
+    # Rendered by other processes from their specs, with the same pixels
+    parallel_images = graphics_to_pillow_images(frames)
+    monkeypatch.delenv("PYTAMARO_RENDER_WORKERS")
+    assert [image.tobytes() for image in parallel_images] == [image.tobytes() for image in images]
+
+
+UNGUARDED_SCRIPT = """
+import multiprocessing
+
+from pytamaro import rectangle, save_animation, save_graphic
+from pytamaro.color_names import blue, red
+
+multiprocessing.set_start_method("spawn")
+save_graphic("large.png", rectangle(2100, 2100, red))
+save_animation("frames.gif", [rectangle(10, 20, red), rectangle(10, 20, blue)])
+"""
+
+
+def test_render_in_parallel_unguarded_script(monkeypatch):
+    import os  # noqa: PLC0415
+    import subprocess  # noqa: PLC0415
+    from pathlib import Path  # noqa: PLC0415
+    from tempfile import TemporaryDirectory  # noqa: PLC0415
+
+    import pytamaro  # noqa: PLC0415
+
+    # A script without a main guard, which would be run again by spawned processes
+    monkeypatch.setenv("PYTAMARO_RENDER_WORKERS", "2")
+    root = Path(pytamaro.__file__).parent.parent
+    monkeypatch.setenv("PYTHONPATH", str(root), prepend=os.pathsep)
+    with TemporaryDirectory() as directory:
+        Path(directory, "script.py").write_text(UNGUARDED_SCRIPT)
+        result = subprocess.run(
+            [sys.executable, "script.py"], cwd=directory, capture_output=True, check=False
+        )
+        assert result.returncode == 0, result.stderr
+        assert ImageMod.open(Path(directory, "large.png")).size == (2100, 2100)
+
+
+def test_render_without_fork(monkeypatch):
+    import multiprocessing  # noqa: PLC0415
+
+    from pytamaro.impl.skia.io import render_workers  # noqa: PLC0415
+
+    monkeypatch.setenv("PYTAMARO_RENDER_WORKERS", "2")
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    # Graphics are rendered by the current process only
+    assert render_workers() == 0
+
+
+def test_render_cache(monkeypatch):
+    from pytamaro.impl.skia.io import graphic_to_pillow_image  # noqa: PLC0415
+    from pytamaro.impl.skia.render_cache import render_cache  # noqa: PLC0415
+
+    render_cache.clear()
+    before = render_cache.info()
+    image = graphic_to_pillow_image(beside(rectangle(WIDTH, HEIGHT, red), rectangle(1, 1, blue)))
+    # An equal (but distinct) graphic is not rendered again
+    cached = graphic_to_pillow_image(beside(rectangle(WIDTH, HEIGHT, red), rectangle(1, 1, blue)))
+    assert cached.tobytes() == image.tobytes()
+    info = render_cache.info()
+    assert (info.hits - before.hits, info.misses - before.misses, info.images) == (1, 1, 1)
+    # A rendering with debugging information is a different image
     with NamedTemporaryFile() as f:
-        filename = f"{f.name}.png"
-        width = 30_000
-        height = 30_000
-        with raises(ValueError, match=f"{width}x{height}"):
-            save_graphic(filename, rectangle(width, height, red))
+        save_graphic(
+            f"{f.name}.png",
+            beside(rectangle(WIDTH, HEIGHT, red), rectangle(1, 1, blue)),
+            debug=True,
+        )
+    assert render_cache.info().images == 2  # noqa: PLR2004
+    # Only the most recent image fits in the cache
+    monkeypatch.setenv("PYTAMARO_RENDER_CACHE_BYTES", str(WIDTH * HEIGHT * 4))
+    graphic_to_pillow_image(rectangle(WIDTH, HEIGHT, blue))
+    info = render_cache.info()
+    assert info.images == 1
+    assert info.evictions - before.evictions == 2  # noqa: PLR2004
+    assert info.size <= info.capacity
+
+
+def test_disk_cache(monkeypatch):
+    import os  # noqa: PLC0415
+    from pathlib import Path  # noqa: PLC0415
+    from tempfile import TemporaryDirectory  # noqa: PLC0415
+
+    import pytamaro  # noqa: PLC0415
+    from pytamaro.color_functions import rgb_color  # noqa: PLC0415
+    from pytamaro.impl.skia.disk_cache import DEFAULT_CAPACITY  # noqa: PLC0415
+    from pytamaro.impl.skia.io import graphic_to_pillow_image  # noqa: PLC0415
+    from pytamaro.impl.skia.render_cache import render_cache  # noqa: PLC0415
+
+    translucent = rgb_color(10, 200, 30, 0.3)
+    with TemporaryDirectory() as directory:
+        monkeypatch.setenv("PYTAMARO_DISK_CACHE_DIR", directory)
+        render_cache.clear()
+        image = graphic_to_pillow_image(
+            above(rectangle(WIDTH, HEIGHT, translucent), rectangle(1, 1, blue))
+        )
+        assert len(list(Path(directory).iterdir())) == 1
+        # Another process would find the (exact) same image on disk
+        render_cache.clear()
+        before = render_cache.info()
+        cached = graphic_to_pillow_image(
+            above(rectangle(WIDTH, HEIGHT, translucent), rectangle(1, 1, blue))
+        )
+        assert cached.tobytes() == image.tobytes()
+        assert len(list(Path(directory).iterdir())) == 1
+        assert render_cache.info().misses - before.misses == 1
+        # The least recently used image is removed when the capacity is exceeded
+        size = Path(directory, os.listdir(directory)[0]).stat().st_size
+        monkeypatch.setenv("PYTAMARO_DISK_CACHE_BYTES", str(size))
+        graphic_to_pillow_image(rectangle(WIDTH, HEIGHT, translucent))
+        assert len(list(Path(directory).iterdir())) == 1
+        # Images rendered by another version of PyTamaro are not used
+        monkeypatch.setenv("PYTAMARO_DISK_CACHE_BYTES", str(DEFAULT_CAPACITY))
+        monkeypatch.setattr(pytamaro, "__version__", "0.0.0")
+        render_cache.clear()
+        graphic_to_pillow_image(rectangle(WIDTH, HEIGHT, translucent))
+        assert len(list(Path(directory).iterdir())) == 2  # noqa: PLR2004
+    render_cache.clear()
+
+
+def test_disk_cache_errors(monkeypatch):
+    import os  # noqa: PLC0415
+    from pathlib import Path  # noqa: PLC0415
+    from tempfile import TemporaryDirectory  # noqa: PLC0415
+
+    from pytamaro.impl.skia import disk_cache  # noqa: PLC0415
+    from pytamaro.impl.skia.io import graphic_to_pillow_image  # noqa: PLC0415
+    from pytamaro.impl.skia.render_cache import render_cache  # noqa: PLC0415
+
+    with TemporaryDirectory() as directory:
+        # The directory of the cache cannot be created (its parent is a file)
+        Path(directory, "file").write_bytes(b"")
+        monkeypatch.setenv("PYTAMARO_DISK_CACHE_DIR", str(Path(directory, "file", "cache")))
+        render_cache.clear()
+        assert graphic_to_pillow_image(rectangle(WIDTH, HEIGHT, red)).size == (WIDTH, HEIGHT)
+        # The image cannot be moved in place: no temporary file is left behind
+        cache = Path(directory, "cache")
+        monkeypatch.setenv("PYTAMARO_DISK_CACHE_DIR", str(cache))
+
+        def fail(*_):
+            raise OSError
+
+        with monkeypatch.context() as context:
+            context.setattr(disk_cache.os, "replace", fail)
+            render_cache.clear()
+            assert graphic_to_pillow_image(rectangle(WIDTH, HEIGHT, red)).size == (WIDTH, HEIGHT)
+        assert not list(cache.iterdir())
+        # Stale temporary files (left behind by a process that died) are removed
+        stale = cache / "stale.tmp"
+        stale.write_bytes(b"")
+        os.utime(stale, (0, 0))
+        render_cache.clear()
+        graphic_to_pillow_image(rectangle(WIDTH, HEIGHT, red))
+        assert [path.suffix for path in cache.iterdir()] == [".img"]
+    render_cache.clear()
+
+
+def test_text_blobs(monkeypatch):
+    from pathlib import Path  # noqa: PLC0415
+
+    from pytamaro.impl.skia.io import graphic_to_pillow_image  # noqa: PLC0415
+    from pytamaro.primitives import text  # noqa: PLC0415
+
+    graphic = beside(text("hello", "", 32, red), rectangle(WIDTH, HEIGHT, blue))
+    outline = graphic_to_pillow_image(graphic)
+    monkeypatch.setenv("PYTAMARO_TEXT_BLOBS", "")
+    blob = graphic_to_pillow_image(graphic)
+    # Same size (and pinning position), drawn differently
+    assert blob.size == outline.size
+    assert blob.getcolors() != outline.getcolors()
+    with NamedTemporaryFile() as f:
+        filename = f"{f.name}.svg"
+        save_graphic(filename, graphic)
+        assert "hello" in Path(filename).read_text()
+
+
+def test_text_blobs_shared_subtree(monkeypatch):
+    from pytamaro.impl.skia.io import graphic_to_pillow_image  # noqa: PLC0415
+    from pytamaro.operations import overlay  # noqa: PLC0415
+    from pytamaro.primitives import text  # noqa: PLC0415
+
+    def label():
+        return overlay(text("hello", "", 32, red), rectangle(WIDTH, HEIGHT, blue))
+
+    shared_label = label()
+    shared = beside(shared_label, shared_label)
+    not_shared = beside(label(), label())
+    monkeypatch.delenv("PYTAMARO_TEXT_BLOBS", raising=False)
+    assert (
+        graphic_to_pillow_image(shared).tobytes() == graphic_to_pillow_image(not_shared).tobytes()
+    )
+    # The picture of the shared label is recorded again with text blobs
+    monkeypatch.setenv("PYTAMARO_TEXT_BLOBS", "")
+    assert (
+        graphic_to_pillow_image(shared).tobytes() == graphic_to_pillow_image(not_shared).tobytes()
+    )
+    with NamedTemporaryFile(suffix=".svg") as f:
+        save_graphic(f.name, shared)
+        assert f.read().count(b"hello") == 2  # noqa: PLR2004
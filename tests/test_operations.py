@@ -10,7 +10,7 @@ from pytamaro.operations import (
     rotate,
 )
 from pytamaro.point_names import bottom_left, bottom_right, top_left
-from pytamaro.primitives import ellipse, rectangle, triangle
+from pytamaro.primitives import ellipse, empty_graphic, rectangle, text, triangle
 from tests.testing_utils import (
     HEIGHT,
     RADIUS,
@@ -93,6 +93,14 @@ def test_rotate_pin_circle():
     assert_pin_tolerance(rotate(90, c), (RADIUS, RADIUS))
 
 
+def test_rotate_deeply_nested_graphic():
+    element = rectangle(WIDTH, HEIGHT, red)
+    from functools import reduce  # noqa: PLC0415
+
+    row = reduce(beside, [element] * 1000, empty_graphic())
+    assert_size(rotate(90, row), (HEIGHT, 1000 * WIDTH))
+
+
 def test_rotate_repr():
     r = rotate(90, rectangle(WIDTH, HEIGHT, red))
     assert_repr(r, "en")
@@ -218,6 +226,23 @@ def test_compose_visually_equals_overlay():
     assert_equals_rendered(compose(s1, s2), overlay(s1, s2))
 
 
+def test_compose_empty_graphic():
+    r = rotate(45, pin(top_left, ellipse(2 * RADIUS, 2 * RADIUS, red)))
+    # The empty graphic does not contribute to the size of the composition
+    assert graphic_width(compose(empty_graphic(), r)) == graphic_width(r)
+    assert graphic_height(compose(r, empty_graphic())) == graphic_height(r)
+
+
+def test_compose_text_outline():
+    # Compositions span the outline of a text, not its leading and trailing spaces
+    spaced = text("  hi  ", "", 20, red)
+    tight = text("hi", "", 20, red)
+    r = rectangle(WIDTH, HEIGHT, red)
+    assert graphic_width(beside(text("  hi", "", 20, red), r)) == graphic_width(beside(tight, r))
+    assert graphic_width(pin(top_left, spaced)) == graphic_width(pin(top_left, tight))
+    assert graphic_width(pin(top_left, spaced)) < graphic_width(spaced)
+
+
 def test_compose_pin_repr():
     s1 = rectangle(WIDTH, WIDTH, blue)
     s2 = rectangle(WIDTH, WIDTH, red)
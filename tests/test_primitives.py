@@ -64,6 +64,11 @@ def test_text():
     assert_color(graphic, red)  # color might not be unique due to antialiasing
 
 
+def test_text_antialiasing():
+    assert text("hello", "", 32, red).antialias  # pyright: ignore[reportAttributeAccessIssue]
+    assert not rectangle(WIDTH, HEIGHT, red).antialias  # pyright: ignore[reportAttributeAccessIssue]
+
+
 def test_text_leading_trailing_spaces():
     regular = "hello"
     leading = " " + regular
@@ -75,6 +80,30 @@ def test_text_leading_trailing_spaces():
     assert graphic_width(graphic_trailing) > graphic_width(graphic_regular)
 
 
+def test_text_font_cache(capfd):
+    first = text("hello", "", 12, red)
+    second = text("world", "", 12, red)
+    assert first.font is second.font  # pyright: ignore[reportAttributeAccessIssue]
+    assert first.font is not text("hello", "", 13, red).font  # pyright: ignore[reportAttributeAccessIssue]
+    # The warning for a missing font is printed only once
+    text("hello", "no such font family", 12, red)
+    text("world", "no such font family", 14, red)
+    assert capfd.readouterr().err.count("no such font family") == 1
+
+
+def test_text_layout_cache():
+    from pytamaro.impl.skia.graphic import _glyph_path  # noqa: PLC0415
+
+    first = text("10", "", 12, red)
+    # The same string is laid out only once, even with a different color
+    assert first.path is text("10", "", 12, blue).path  # pyright: ignore[reportAttributeAccessIssue]
+    # The glyphs of a new string are shared with the previous ones
+    before = _glyph_path.cache_info()
+    assert_size(text("01", "", 12, red), (graphic_width(first), graphic_height(first)))
+    info = _glyph_path.cache_info()
+    assert (info.hits - before.hits, info.misses - before.misses) == (2, 0)
+
+
 def test_text_repr():
     assert_repr(text("hello", "", 12, red), "en")
 